@@ -8,16 +8,48 @@ Tracks bright/dark blobs in a video and adds cool visual effects:
 
 import cv2
 import numpy as np
-from collections import deque
 import argparse
+import os
+import queue
 import sys
+import threading
+import time
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # Optional: only used to speed up connections with many blobs
+    cKDTree = None
+
+
+# Number of trail slots; blobs are assigned to slots by detection order
+MAX_TRAILS = 20
+
+# Above this many blobs, connection pairs are found with a KD-tree (if scipy is available)
+KDTREE_MIN_BLOBS = 32
+
+
+def _draw_segments(frame, xy0, xy1, color):
+    """
+    Draw line segments from xy0[k] to xy1[k] in a single OpenCV call.
+    
+    Args:
+        frame: Frame to draw on (modified in place)
+        xy0: (N, 2) int32 array of segment start points
+        xy1: (N, 2) int32 array of segment end points
+        color: Line color (BGR)
+    """
+    if len(xy0) == 0:
+        return
+    
+    segments = np.stack([xy0, xy1], axis=1)  # (N, 2, 2)
+    cv2.polylines(frame, list(segments), False, color, 1, cv2.LINE_AA)
 
 
 class BlobTracker:
     def __init__(self, trail_length=30, min_blob_size=10, max_blob_size=500, 
                  max_blobs=None, max_connection_distance=500, 
                  use_background_subtraction=False, background_frames=30, 
-                 diff_threshold=0.15):
+                 diff_threshold=0.15, background_downsample=True):
         """
         Initialize the blob tracker with visual effects.
         
@@ -30,6 +62,7 @@ class BlobTracker:
             use_background_subtraction: Use background subtraction instead of bright/dark detection
             background_frames: Number of frames for background model
             diff_threshold: Threshold for background difference (0.0-1.0)
+            background_downsample: Run background subtraction at half resolution
         """
         self.trail_length = trail_length
         self.min_blob_size = min_blob_size
@@ -38,55 +71,87 @@ class BlobTracker:
         self.max_connection_distance = max_connection_distance
         self.use_background_subtraction = use_background_subtraction
         self.diff_threshold = diff_threshold
+        self.background_downsample = background_downsample
         
-        # Store blob positions history for trails
-        self.blob_trails = {}
-        self.next_blob_id = 0
+        # Store blob positions history for trails: one ring buffer of
+        # (x, y) points per trail, plus how many points each has received
+        self._trail_xy = np.full((MAX_TRAILS, trail_length, 2), -1, dtype=np.int32)
+        self._trail_head = np.zeros(MAX_TRAILS, dtype=np.int64)
         
         # Background subtraction model (if enabled)
         self.background_model = None
         self.background_frames = background_frames
-        self.frame_buffer = deque(maxlen=background_frames)
+        self.background_alpha = 1.0 / max(1, background_frames)
+        self.background_count = 0
         self.is_background_initialized = False
+        self._background_acc = None
         
-        # Setup blob detector
-        params = cv2.SimpleBlobDetector_Params()
-        
-        # Filter by area
-        params.filterByArea = True
-        params.minArea = min_blob_size
-        params.maxArea = max_blob_size
+        # Reusable per-frame buffers (allocated on first frame)
+        self._small = None
+        self._gray = None
+        self._diff_buf = None
+        self._mask_buf = None
+        self._bright_mask = None
+        self._dark_mask = None
+        self.kernel = np.ones((3, 3), np.uint8)
         
-        # Filter by circularity (0.0 to 1.0)
-        params.filterByCircularity = False
+        # Drawing steps per combination of display options (see _get_draw_steps)
+        self._draw_steps = {}
+    
+    def _detect_blobs(self, mask, scale=1):
+        """
+        Find blobs in a binary mask using connected components.
         
-        # Filter by convexity
-        params.filterByConvexity = False
+        Args:
+            mask: Binary mask (255 = foreground)
+            scale: Factor from mask coordinates to frame coordinates
+            
+        Returns:
+            List of cv2.KeyPoint with the blob center in .pt and the
+            equivalent circle diameter in .size (in frame coordinates)
+        """
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
         
-        # Filter by inertia
-        params.filterByInertia = False
+        # Filter by area (in frame pixels), skipping label 0 (background)
+        areas = stats[1:, cv2.CC_STAT_AREA] * (scale * scale)
+        keep = np.nonzero((areas >= self.min_blob_size) & (areas <= self.max_blob_size))[0]
+        centers = centroids[keep + 1] * scale
+        diameters = 2 * np.sqrt(areas[keep] / np.pi)
         
-        # Filter by color (detect white blobs in mask)
-        params.filterByColor = True
-        params.blobColor = 255
+        return [cv2.KeyPoint(x, y, d) for (x, y), d in zip(centers.tolist(), diameters.tolist())]
+    
+    def _ensure_buffers(self, frame):
+        """Allocate the per-frame grayscale/mask buffers to match the frame size."""
+        shape = frame.shape[:2]
+        if self._gray is not None and self._gray.shape == shape:
+            return
         
-        self.detector = cv2.SimpleBlobDetector_create(params)
+        self._gray = np.empty(shape, dtype=np.uint8)
+        self._diff_buf = np.empty(shape, dtype=np.uint8)
+        self._mask_buf = np.empty(shape, dtype=np.uint8)
+        self._bright_mask = np.empty(shape, dtype=np.uint8)
+        self._dark_mask = np.empty(shape, dtype=np.uint8)
     
     def _update_background(self, frame):
         """
         Update the background model with new frame.
-        Uses median of recent frames for robust background estimation.
+        Uses an exponential running average of recent frames, so only a
+        single background image is kept in memory.
         """
-        # Convert to grayscale and normalize to 0-1
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        normalized = gray.astype(np.float32) / 255.0
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
         
-        # Add frame to buffer
-        self.frame_buffer.append(normalized)
+        # Seed the model with the first frame, then blend new frames in
+        if self._background_acc is None:
+            self._background_acc = gray.astype(np.float32)
+            self.background_model = gray.copy()
+        else:
+            cv2.accumulateWeighted(gray, self._background_acc, self.background_alpha)
+            cv2.convertScaleAbs(self._background_acc, dst=self.background_model)
         
-        # Once we have enough frames, compute the median background
-        if len(self.frame_buffer) >= self.background_frames:
-            self.background_model = np.median(np.array(self.frame_buffer), axis=0)
+        self.background_count += 1
+        
+        # Once we have seen enough frames, the background is usable
+        if self.background_count >= self.background_frames:
             self.is_background_initialized = True
     
     def _create_difference_mask(self, frame):
@@ -99,27 +164,23 @@ class BlobTracker:
         Returns:
             Binary mask (255 where difference > threshold, 0 otherwise)
         """
-        # Convert to grayscale and normalize
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        normalized = gray.astype(np.float32) / 255.0
-        
-        # Calculate absolute difference from background
-        diff = np.abs(normalized - self.background_model)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
         
-        # Create binary mask where difference > threshold
-        mask = (diff > self.diff_threshold).astype(np.uint8) * 255
+        # Absolute difference from background, thresholded in 0-255 units
+        cv2.absdiff(gray, self.background_model, dst=self._diff_buf)
+        cv2.threshold(self._diff_buf, int(self.diff_threshold * 255), 255,
+                      cv2.THRESH_BINARY, dst=self._mask_buf)
         
         # Apply morphological operations to clean up the mask
-        kernel = np.ones((3, 3), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)  # Remove noise
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)  # Fill holes
+        cv2.morphologyEx(self._mask_buf, cv2.MORPH_OPEN, self.kernel, dst=self._mask_buf)  # Remove noise
+        cv2.morphologyEx(self._mask_buf, cv2.MORPH_CLOSE, self.kernel, dst=self._mask_buf)  # Fill holes
         
-        return mask
+        return self._mask_buf
     
     def process_frame(self, frame, detect_bright=True, detect_dark=False, 
                      show_trails=True, show_connections=True, show_boxes=True,
                      marker_style='both', use_points=False, invert_regions=False, 
-                     show_numbers=False):
+                     show_numbers=False, inplace=False):
         """
         Process a single frame and add visual effects.
         
@@ -134,48 +195,55 @@ class BlobTracker:
             use_points: Use points instead of squares
             invert_regions: Invert the region colors (negative effect)
             show_numbers: Show blob numbers as text
+            inplace: Draw effects directly onto frame instead of a copy
             
         Returns:
             Processed frame with effects
         """
-        # Create output frame
-        output = frame.copy()
+        # Create output frame (or reuse the input if the caller doesn't need it)
+        output = frame if inplace else frame.copy()
         
         all_blobs = []
         
         if self.use_background_subtraction:
-            # Use background subtraction method
-            self._update_background(frame)
+            # Use background subtraction method, optionally at half resolution
+            if self.background_downsample:
+                self._small = cv2.pyrDown(frame, dst=self._small)
+                bg_frame, scale = self._small, 2
+            else:
+                bg_frame, scale = frame, 1
+            
+            self._ensure_buffers(bg_frame)
+            self._update_background(bg_frame)
             
             # If background not initialized yet, return frame without effects
             if not self.is_background_initialized:
                 return output
             
             # Create difference mask
-            mask = self._create_difference_mask(frame)
+            mask = self._create_difference_mask(bg_frame)
             
-            # Detect blobs in the mask
-            blobs = self.detector.detect(mask)
+            # Detect blobs in the mask (coordinates scaled back to full resolution)
+            blobs = self._detect_blobs(mask, scale)
             all_blobs = [(blob, (255, 255, 255)) for blob in blobs]
         else:
+            self._ensure_buffers(frame)
+            
             # Use original bright/dark detection method
             # Convert to grayscale for blob detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
             
-            # Detect bright blobs
+            # Bright regions are gray > 200, dark regions are gray < 55. Each
+            # gets its own mask: ORed together, a bright blob merges with the
+            # dark background around it into one oversized component.
+            blobs = []
             if detect_bright:
-                # Apply threshold to get bright regions
-                _, bright_mask = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-                bright_blobs = self.detector.detect(bright_mask)
-                all_blobs.extend([(blob, (255, 255, 255)) for blob in bright_blobs])  # White
-            
-            # Detect dark blobs
+                cv2.compare(gray, 200, cv2.CMP_GT, dst=self._bright_mask)
+                blobs += self._detect_blobs(self._bright_mask)
             if detect_dark:
-                # Invert for dark regions
-                dark_mask = cv2.bitwise_not(gray)
-                _, dark_mask = cv2.threshold(dark_mask, 200, 255, cv2.THRESH_BINARY)
-                dark_blobs = self.detector.detect(dark_mask)
-                all_blobs.extend([(blob, (255, 255, 255)) for blob in dark_blobs])  # White
+                cv2.compare(gray, 55, cv2.CMP_LT, dst=self._dark_mask)
+                blobs += self._detect_blobs(self._dark_mask)
+            all_blobs = [(blob, (255, 255, 255)) for blob in blobs]  # White
         
         # Limit number of blobs if max_blobs is set
         if self.max_blobs is not None and len(all_blobs) > self.max_blobs:
@@ -184,144 +252,166 @@ class BlobTracker:
         
         # If no blobs detected, clean up old trails
         if not all_blobs:
-            self.blob_trails.clear()
+            self._trail_head[:] = 0
             return output
         
         # Extract blob centers
         current_positions = [(blob.pt, color) for blob, color in all_blobs]
         
-        # Update trails
-        if show_trails:
-            self._update_trails(current_positions)
+        # Run only the drawing steps enabled for these options
+        steps = self._get_draw_steps(show_trails, show_connections, show_boxes,
+                                     marker_style, use_points, invert_regions, show_numbers)
+        for step in steps:
+            step(output, all_blobs, current_positions)
+        
+        return output
+    
+    def _get_draw_steps(self, show_trails, show_connections, show_boxes,
+                        marker_style, use_points, invert_regions, show_numbers):
+        """
+        Return the drawing steps for a combination of display options.
+        
+        The display options rarely change between frames, so the list of
+        enabled steps is built once per combination and cached. Each step
+        is called as step(output, blobs, positions).
+        """
+        key = (show_trails, show_connections, show_boxes, marker_style,
+               use_points, invert_regions, show_numbers)
+        steps = self._draw_steps.get(key)
+        if steps is not None:
+            return steps
+        
+        steps = []
         
-        # Draw trails
+        # Update and draw trails
         if show_trails:
-            self._draw_trails(output)
+            def trails_step(output, blobs, positions):
+                self._update_trails(positions)
+                self._draw_trails(output)
+            steps.append(trails_step)
         
         # Draw connecting lines between blobs
         if show_connections:
-            self._draw_connections(output, current_positions)
+            steps.append(lambda output, blobs, positions: self._draw_connections(output, positions))
         
         # Draw blob markers
         if show_boxes:
-            self._draw_blobs(output, all_blobs, marker_style, use_points, 
-                           invert_regions, show_numbers)
+            steps.append(lambda output, blobs, positions: self._draw_blobs(
+                output, blobs, marker_style, use_points, invert_regions, show_numbers))
         
-        return output
+        steps = tuple(steps)
+        self._draw_steps[key] = steps
+        return steps
     
     def _update_trails(self, current_positions):
         """Update the position history for each blob."""
         # Simple assignment: assign current positions to trail IDs
         # For more complex tracking, you could use distance-based matching
-        
-        # Clear old trails if we have too many
-        if len(self.blob_trails) > 50:
-            self.blob_trails.clear()
-            self.next_blob_id = 0
-        
-        # Add current positions to trails
         for i, (pos, color) in enumerate(current_positions):
-            trail_id = i % 20  # Cycle through 20 trail IDs
+            trail_id = i % MAX_TRAILS  # Cycle through the trail IDs
             
-            if trail_id not in self.blob_trails:
-                self.blob_trails[trail_id] = deque(maxlen=self.trail_length)
-            
-            self.blob_trails[trail_id].append((pos, color))
+            head = self._trail_head[trail_id]
+            self._trail_xy[trail_id, head % self.trail_length] = (int(pos[0]), int(pos[1]))
+            self._trail_head[trail_id] = head + 1
     
     def _draw_trails(self, frame):
         """Draw motion trails for each blob."""
-        for trail_id, positions in self.blob_trails.items():
-            if len(positions) < 2:
-                continue
+        trails = []
+        for trail_id in np.nonzero(np.minimum(self._trail_head, self.trail_length) >= 2)[0]:
+            head = self._trail_head[trail_id]
+            ring = self._trail_xy[trail_id]
             
-            # Draw trail without fading effect
-            for i in range(len(positions) - 1):
-                if positions[i] is None or positions[i + 1] is None:
-                    continue
-                
-                pos1, color1 = positions[i]
-                pos2, color2 = positions[i + 1]
-                
-                # White color (no fading)
-                trail_color = (255, 255, 255)
-                
-                cv2.line(frame, 
-                        (int(pos1[0]), int(pos1[1])),
-                        (int(pos2[0]), int(pos2[1])),
-                        trail_color, 
-                        1,  # 1px thick
-                        cv2.LINE_AA)
+            # Oldest to newest point; once the ring has wrapped, the oldest is at head
+            if head <= self.trail_length:
+                trails.append(ring[:head])
+            else:
+                trails.append(np.roll(ring, -(head % self.trail_length), axis=0))
+        
+        if trails:
+            # White color (no fading), 1px thick
+            cv2.polylines(frame, trails, False, (255, 255, 255), 1, cv2.LINE_AA)
     
     def _draw_connections(self, frame, positions):
         """Draw connecting lines between all detected blobs."""
         if len(positions) < 2:
             return
         
-        # Draw lines between all pairs of blobs
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
-                pos1, color1 = positions[i]
-                pos2, color2 = positions[j]
-                
-                # Calculate distance
-                dist = np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
-                
-                # Only connect if distance is within max_connection_distance
-                if dist < self.max_connection_distance:
-                    # White color (no fading)
-                    line_color = (255, 255, 255)
-                    
-                    cv2.line(frame,
-                            (int(pos1[0]), int(pos1[1])),
-                            (int(pos2[0]), int(pos2[1])),
-                            line_color,
-                            1,  # 1px thick
-                            cv2.LINE_AA)
+        pts = np.asarray([pos for pos, color in positions], dtype=np.float32)
+        
+        # Only connect pairs closer than max_connection_distance
+        max_d2 = self.max_connection_distance * self.max_connection_distance
+        if cKDTree is not None and len(pts) > KDTREE_MIN_BLOBS:
+            # Many blobs: query neighbors from a KD-tree instead of all N^2 pairs
+            pairs = cKDTree(pts).query_pairs(self.max_connection_distance, output_type='ndarray')
+            pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]  # Same draw order as below
+            # query_pairs includes pairs at exactly the distance; keep the
+            # strict comparison of the broadcast path
+            pair_d2 = ((pts[pairs[:, 0]] - pts[pairs[:, 1]]) ** 2).sum(-1)
+            pairs = pairs[pair_d2 < max_d2]
+            pairs_i, pairs_j = pairs[:, 0], pairs[:, 1]
+        else:
+            # Pairwise squared distances (upper triangle = each pair once)
+            d2 = ((pts[:, None, :] - pts[None, :, :]) ** 2).sum(-1)
+            pairs_i, pairs_j = np.where(np.triu(d2 < max_d2, k=1))
+        
+        # White color (no fading)
+        pts = pts.astype(np.int32)
+        _draw_segments(frame, pts[pairs_i], pts[pairs_j], (255, 255, 255))
     
     def _draw_blobs(self, frame, blobs, marker_style='both', use_points=False, 
                    invert_regions=False, show_numbers=False):
         """Draw markers on detected blobs."""
-        for idx, (blob, color) in enumerate(blobs, 1):
-            x, y = blob.pt
-            size = blob.size
-            
-            # Determine color (inverted or normal)
-            marker_color = (0, 0, 0) if invert_regions else (255, 255, 255)
+        if not blobs:
+            return
+        
+        # Settings that are the same for every blob
+        marker_color = (0, 0, 0) if invert_regions else (255, 255, 255)  # Inverted or normal
+        draw_outer = marker_style in ('both', 'outer')
+        draw_inner = marker_style in ('both', 'inner')
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 0.5
+        thickness = 1
+        
+        # Compute all marker geometry at once
+        pts = np.asarray([blob.pt for blob, color in blobs], dtype=np.float64)
+        sizes = np.asarray([blob.size for blob, color in blobs], dtype=np.float64)
+        half_outer = (sizes * 1.5).astype(np.int32)[:, None]
+        half_inner = (sizes * 0.5).astype(np.int32)[:, None]
+        centers = pts.astype(np.int32).tolist()
+        top_left_outer = (pts - half_outer).astype(np.int32).tolist()
+        bottom_right_outer = (pts + half_outer).astype(np.int32).tolist()
+        top_left_inner = (pts - half_inner).astype(np.int32).tolist()
+        bottom_right_inner = (pts + half_inner).astype(np.int32).tolist()
+        
+        for i in range(len(blobs)):
+            center = tuple(centers[i])
             
             if use_points:
                 # Draw as points (small circles)
-                cv2.circle(frame, (int(x), int(y)), 3, marker_color, -1, cv2.LINE_AA)
+                cv2.circle(frame, center, 3, marker_color, -1, cv2.LINE_AA)
                 # Outer ring
-                cv2.circle(frame, (int(x), int(y)), 6, marker_color, 1, cv2.LINE_AA)
+                cv2.circle(frame, center, 6, marker_color, 1, cv2.LINE_AA)
             else:
                 # Draw as squares
-                if marker_style in ['both', 'outer']:
-                    # Draw outer square
-                    half_size_outer = int(size * 1.5)
-                    top_left_outer = (int(x - half_size_outer), int(y - half_size_outer))
-                    bottom_right_outer = (int(x + half_size_outer), int(y + half_size_outer))
-                    cv2.rectangle(frame, top_left_outer, bottom_right_outer, marker_color, 1, cv2.LINE_AA)
+                if draw_outer:
+                    cv2.rectangle(frame, tuple(top_left_outer[i]), tuple(bottom_right_outer[i]),
+                                  marker_color, 1, cv2.LINE_AA)
                 
-                if marker_style in ['both', 'inner']:
-                    # Draw inner square
-                    half_size_inner = int(size * 0.5)
-                    top_left_inner = (int(x - half_size_inner), int(y - half_size_inner))
-                    bottom_right_inner = (int(x + half_size_inner), int(y + half_size_inner))
-                    cv2.rectangle(frame, top_left_inner, bottom_right_inner, marker_color, 1, cv2.LINE_AA)
+                if draw_inner:
+                    cv2.rectangle(frame, tuple(top_left_inner[i]), tuple(bottom_right_inner[i]),
+                                  marker_color, 1, cv2.LINE_AA)
             
             # Draw blob number
             if show_numbers:
-                text = str(idx)
-                font = cv2.FONT_HERSHEY_SIMPLEX
-                font_scale = 0.5
-                thickness = 1
+                text = str(i + 1)
+                x, y = pts[i]
                 
                 # Get text size for positioning
                 (text_width, text_height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
                 
                 # Position text above the blob
                 text_x = int(x - text_width / 2)
-                text_y = int(y - size * 2)
+                text_y = int(y - sizes[i] * 2)
                 
                 # Draw text background for readability (optional black background)
                 # if not invert_regions:
@@ -335,13 +425,53 @@ class BlobTracker:
                           marker_color, thickness, cv2.LINE_AA)
 
 
+def _open_capture(input_path):
+    """Open a video for reading, preferring hardware-accelerated decoding."""
+    cap = cv2.VideoCapture(input_path, cv2.CAP_FFMPEG,
+                           [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    if not cap.isOpened():
+        # Fall back to the default backend
+        cap = cv2.VideoCapture(input_path)
+    return cap
+
+
+def _open_writer(output_path, fps, frame_size):
+    """Open a video for writing, preferring hardware-accelerated encoding."""
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    out = cv2.VideoWriter(output_path, cv2.CAP_FFMPEG, fourcc, fps, frame_size,
+                          [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    if not out.isOpened():
+        # Fall back to the default software encoder
+        out = cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+    return out
+
+
+def _read_frames(cap, read_q, stop_event):
+    """Decode frames into read_q until the video ends or stop_event is set."""
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        read_q.put(frame)
+    read_q.put(None)  # Sentinel: no more frames
+
+
+def _write_frames(out, write_q):
+    """Encode frames from write_q in FIFO order until the sentinel arrives."""
+    while True:
+        frame = write_q.get()
+        if frame is None:
+            break
+        out.write(frame)
+
+
 def process_video(input_path, output_path, detect_bright=True, detect_dark=True, 
                   trail_length=30, preview=False, show_trails=True, 
                   show_connections=True, show_boxes=True, max_blobs=None,
                   max_connection_distance=500, marker_style='both', use_points=False,
                   invert_regions=False, show_numbers=False, 
                   use_background_subtraction=False, background_frames=30, 
-                  diff_threshold=0.15):
+                  diff_threshold=0.15, num_threads=None, show_progress=True):
     """
     Process a video file with blob tracking effects.
     
@@ -364,9 +494,19 @@ def process_video(input_path, output_path, detect_bright=True, detect_dark=True,
         use_background_subtraction: Use background subtraction instead of bright/dark detection
         background_frames: Number of frames for background model
         diff_threshold: Threshold for background difference (0.0-1.0)
+        num_threads: Threads for OpenCV's internal parallel loops; this setting
+            is process-wide (None = all cores but two)
+        show_progress: Print a progress line while processing (turn off when
+            running several videos at once, or their lines overwrite each other)
     """
+    # Let OpenCV's internal parallel loops use the remaining cores,
+    # leaving two for the reader and writer threads
+    if num_threads is None:
+        num_threads = max(1, (os.cpu_count() or 1) - 2)
+    cv2.setNumThreads(num_threads)
+    
     # Open input video
-    cap = cv2.VideoCapture(input_path)
+    cap = _open_capture(input_path)
     
     if not cap.isOpened():
         print(f"Error: Could not open video file '{input_path}'")
@@ -381,8 +521,7 @@ def process_video(input_path, output_path, detect_bright=True, detect_dark=True,
     print(f"Input video: {width}x{height} @ {fps}fps, {total_frames} frames")
     
     # Setup video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    out = _open_writer(output_path, fps, (width, height))
     
     if not out.isOpened():
         print(f"Error: Could not create output video file '{output_path}'")
@@ -412,22 +551,34 @@ def process_video(input_path, output_path, detect_bright=True, detect_dark=True,
         print(f"Max connection distance: {max_connection_distance}px")
     
     frame_count = 0
+    last_progress = time.monotonic()
+    
+    # Decode and encode on their own threads so I/O overlaps with tracking.
+    # The tracker itself stays on this thread since it is stateful.
+    prefetch = 8
+    read_q = queue.Queue(maxsize=prefetch)
+    write_q = queue.Queue(maxsize=prefetch)
+    stop_event = threading.Event()
+    reader = threading.Thread(target=_read_frames, args=(cap, read_q, stop_event), daemon=True)
+    writer = threading.Thread(target=_write_frames, args=(out, write_q), daemon=True)
+    reader.start()
+    writer.start()
     
     try:
         while True:
-            ret, frame = cap.read()
+            frame = read_q.get()
             
-            if not ret:
+            if frame is None:
                 break
             
-            # Process frame
+            # Process frame (in place: each decoded frame is only used once)
             processed = tracker.process_frame(frame, detect_bright, detect_dark,
                                             show_trails, show_connections, show_boxes,
                                             marker_style, use_points, invert_regions, 
-                                            show_numbers)
+                                            show_numbers, inplace=True)
             
             # Write frame
-            out.write(processed)
+            write_q.put(processed)
             
             # Show preview if requested
             if preview:
@@ -438,12 +589,27 @@ def process_video(input_path, output_path, detect_bright=True, detect_dark=True,
             
             frame_count += 1
             
-            # Progress indicator
-            if frame_count % 30 == 0:
+            # Progress indicator (at most once per second to keep the console off the hot path)
+            now = time.monotonic()
+            if show_progress and now - last_progress > 1.0:
                 progress = (frame_count / total_frames) * 100
-                print(f"Progress: {frame_count}/{total_frames} frames ({progress:.1f}%)", end='\r')
+                sys.stdout.write(f"Progress: {frame_count}/{total_frames} frames ({progress:.1f}%)\r")
+                sys.stdout.flush()
+                last_progress = now
     
     finally:
+        # Stop the reader, draining the queue in case it is blocked on a full put
+        stop_event.set()
+        while reader.is_alive():
+            try:
+                read_q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        
+        # Let the writer flush everything already queued
+        write_q.put(None)
+        writer.join()
+        
         # Cleanup
         cap.release()
         out.release()
@@ -6,7 +6,6 @@ for demonstrating the blob tracker effects.
 
 import cv2
 import numpy as np
-import math
 
 
 def create_test_video(output_path='test_input.mp4', duration_seconds=10, fps=30):
@@ -27,34 +26,44 @@ def create_test_video(output_path='test_input.mp4', duration_seconds=10, fps=30)
     
     print(f"Creating test video: {width}x{height} @ {fps}fps, {total_frames} frames")
     
+    # Pre-draw all random sparkles (x, y, size) for every frame in one call
+    rng = np.random.default_rng()
+    sparkles = rng.integers([50, 50, 5], [width - 50, height - 50, 15],
+                            size=(total_frames, 5, 3))
+    
+    # Precompute the trajectory sines/cosines for every frame
+    t = np.arange(total_frames) / fps
+    c2 = np.cos(t * 2)
+    s2 = np.sin(t * 2)
+    s15 = np.sin(t * 1.5)
+    s3 = np.sin(t * 3)
+    c25 = np.cos(t * 2.5)
+    
     for frame_num in range(total_frames):
         # Create dark background
         frame = np.zeros((height, width, 3), dtype=np.uint8)
         frame[:] = (20, 20, 30)  # Dark blue background
         
-        # Calculate time for smooth animation
-        t = frame_num / fps
-        
         # Create multiple moving bright blobs
         
         # Blob 1: Circular motion
-        x1 = int(width/2 + 200 * math.cos(t * 2))
-        y1 = int(height/2 + 200 * math.sin(t * 2))
+        x1 = int(width/2 + 200 * c2[frame_num])
+        y1 = int(height/2 + 200 * s2[frame_num])
         cv2.circle(frame, (x1, y1), 30, (255, 255, 255), -1)
         
         # Blob 2: Figure-8 motion
-        x2 = int(width/2 + 300 * math.sin(t * 1.5))
-        y2 = int(height/2 + 150 * math.sin(t * 3))
+        x2 = int(width/2 + 300 * s15[frame_num])
+        y2 = int(height/2 + 150 * s3[frame_num])
         cv2.circle(frame, (x2, y2), 25, (255, 255, 200), -1)
         
         # Blob 3: Horizontal oscillation
-        x3 = int(width/4 + 100 * math.sin(t * 3))
+        x3 = int(width/4 + 100 * s3[frame_num])
         y3 = int(height/3)
         cv2.circle(frame, (x3, y3), 20, (255, 200, 255), -1)
         
         # Blob 4: Vertical oscillation
         x4 = int(3 * width/4)
-        y4 = int(height/2 + 150 * math.cos(t * 2.5))
+        y4 = int(height/2 + 150 * c25[frame_num])
         cv2.circle(frame, (x4, y4), 22, (200, 255, 255), -1)
         
         # Blob 5: Diagonal motion
@@ -63,10 +72,7 @@ def create_test_video(output_path='test_input.mp4', duration_seconds=10, fps=30)
         cv2.circle(frame, (x5, y5), 18, (255, 255, 150), -1)
         
         # Add some random sparkles
-        for _ in range(5):
-            rx = np.random.randint(50, width - 50)
-            ry = np.random.randint(50, height - 50)
-            size = np.random.randint(5, 15)
+        for rx, ry, size in sparkles[frame_num].tolist():
             cv2.circle(frame, (rx, ry), size, (255, 255, 255), -1)
         
         # Write frame
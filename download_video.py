@@ -7,23 +7,184 @@ Supports various video platforms and direct video links.
 
 import sys
 import os
-import argparse
+import importlib.util
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from urllib.parse import urlparse
-import subprocess
 
 
-def is_yt_dlp_installed():
-    """Check if yt-dlp is installed."""
+# Direct video links end in one of these extensions
+_VIDEO_EXT_RE = re.compile(r'\.(?:mp4|avi|mov|mkv|flv|wmv|webm|m4v)$', re.I)
+
+# Hosts (and their subdomains) of supported video platforms
+_PLATFORM_RE = re.compile(
+    r'(?:^|\.)(?:youtube\.com|youtu\.be|vimeo\.com|dailymotion\.com|twitter\.com|x\.com|'
+    r'facebook\.com|instagram\.com|tiktok\.com|twitch\.tv|reddit\.com)$',
+    re.I
+)
+
+# Smallest byte range worth fetching on its own connection
+_RANGE_MIN_PART = 1 << 20
+
+# Connect/read timeouts for HTTP requests (seconds)
+_HTTP_TIMEOUT = (10, 60)
+
+# Default number of fragments yt-dlp downloads at once (HLS/DASH streams)
+_FRAGMENT_CONCURRENCY = 8
+
+# Read size when copying a response body to disk
+_COPY_BUFSIZE = 1 << 20
+
+# Minimum seconds between progress updates
+_PROGRESS_INTERVAL = 0.05
+
+# Shared requests.Session, created on first use (see _get_session)
+_SESSION = None
+
+# Command-line parser, built on first use (see _get_parser)
+_PARSER = None
+
+# Shared HTTP/2 httpx.Client, created on first use (see _get_http2_client);
+# False once we know httpx/h2 isn't installed
+_HTTP2_CLIENT = None
+_HTTP2_CLIENT_LOCK = threading.Lock()
+
+# YoutubeDL instances reused across downloads with identical options
+# (per thread, since YoutubeDL isn't safe to share between threads)
+_YDL_LOCAL = threading.local()
+
+
+def _get_session():
+    """Return the shared requests.Session, so downloads reuse keep-alive connections."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        _SESSION = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=3)
+        _SESSION.mount('https://', adapter)
+        _SESSION.mount('http://', adapter)
+    return _SESSION
+
+
+def _get_http2_client():
+    """
+    Return the shared HTTP/2 httpx.Client, or None if httpx[http2] isn't installed.
+    
+    Over HTTP/2 all byte ranges of a download share one multiplexed connection.
+    """
+    global _HTTP2_CLIENT
+    if _HTTP2_CLIENT is None:
+        # download_many calls this from several threads; build only one client
+        with _HTTP2_CLIENT_LOCK:
+            if _HTTP2_CLIENT is None:
+                try:
+                    import httpx
+                    
+                    transport = httpx.HTTPTransport(
+                        http2=True, retries=3,
+                        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+                    )
+                    _HTTP2_CLIENT = httpx.Client(
+                        transport=transport, follow_redirects=True,
+                        timeout=httpx.Timeout(_HTTP_TIMEOUT[1], connect=_HTTP_TIMEOUT[0])
+                    )
+                except ImportError:  # httpx or its h2 extra is missing
+                    _HTTP2_CLIENT = False
+    return _HTTP2_CLIENT or None
+
+
+def _is_httpx(client):
+    """Whether client is an httpx.Client (rather than a requests.Session)."""
+    httpx = sys.modules.get('httpx')  # Never imported means it can't be one
+    return httpx is not None and isinstance(client, httpx.Client)
+
+
+def _head(client, url):
+    """
+    Send a HEAD request (following redirects) with a requests.Session or httpx.Client.
+    
+    Returns None if the server rejects it (some only allow GET, e.g. 405, or
+    403 on presigned URLs).
+    """
+    if _is_httpx(client):
+        response = client.head(url)
+    else:
+        response = client.head(url, allow_redirects=True, timeout=_HTTP_TIMEOUT)
+    if response.status_code >= 400:
+        return None
+    return response
+
+
+@contextmanager
+def _stream_get(client, url, headers=None):
+    """Stream a GET response from a requests.Session or httpx.Client."""
+    if _is_httpx(client):
+        with client.stream('GET', url, headers=headers) as response:
+            yield response
+    else:
+        with client.get(url, headers=headers, stream=True, timeout=_HTTP_TIMEOUT) as response:
+            yield response
+
+
+def _get_youtube_dl(opts):
+    """Return a cached yt_dlp.YoutubeDL for the given options (creating it if needed)."""
+    from yt_dlp import YoutubeDL
+    
+    cache = getattr(_YDL_LOCAL, 'cache', None)
+    if cache is None:
+        cache = _YDL_LOCAL.cache = {}
+    
+    key = frozenset(opts.items())
+    ydl = cache.get(key)
+    if ydl is None:
+        ydl = YoutubeDL(opts)
+        cache[key] = ydl
+    return ydl
+
+
+def _run_command(cmd):
+    """
+    Run an external command (yt-dlp, curl, wget), raising CalledProcessError on failure.
+    
+    On Ctrl+C the child is terminated (and killed if it lingers) before
+    KeyboardInterrupt propagates. close_fds=False lets subprocess launch the child with posix_spawn
+    instead of fork+exec; these tools don't rely on fds we might leak.
+    """
+    import subprocess
+    
+    proc = subprocess.Popen(cmd, close_fds=False)
     try:
-        subprocess.run(['yt-dlp', '--version'], 
-                      capture_output=True, 
-                      check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        returncode = proc.wait()
+    except KeyboardInterrupt:
+        # The child shares our process group, so it saw the Ctrl+C too; give
+        # it a moment to clean up, then make sure it's gone before re-raising
+        proc.terminate()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        raise
+    
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
 
 
-def download_with_yt_dlp(url, output_path=None, quality='best'):
+@lru_cache(maxsize=1)
+def is_yt_dlp_installed():
+    """Check if yt-dlp is installed (as a Python module or a command)."""
+    return (importlib.util.find_spec('yt_dlp') is not None
+            or shutil.which('yt-dlp') is not None)
+
+
+def download_with_yt_dlp(url, output_path=None, quality='best', concurrency=_FRAGMENT_CONCURRENCY):
     """
     Download video using yt-dlp (supports YouTube, Vimeo, and many other platforms).
     
@@ -31,6 +192,7 @@ def download_with_yt_dlp(url, output_path=None, quality='best'):
         url: Video URL
         output_path: Output file path (optional)
         quality: Video quality ('best', 'worst', or specific format)
+        concurrency: Number of stream fragments to download in parallel
     """
     if not is_yt_dlp_installed():
         print("Error: yt-dlp is not installed")
@@ -40,39 +202,88 @@ def download_with_yt_dlp(url, output_path=None, quality='best'):
         print("  brew install yt-dlp")
         return False
     
-    cmd = ['yt-dlp']
-    
-    # Add quality option
+    # Select format
     if quality == 'best':
-        cmd.extend(['-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'])
+        video_format = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'
     elif quality == 'worst':
-        cmd.extend(['-f', 'worst'])
+        video_format = 'worst'
     else:
-        cmd.extend(['-f', quality])
+        video_format = quality
     
-    # Add output template
-    if output_path:
-        cmd.extend(['-o', output_path])
-    else:
-        cmd.extend(['-o', '%(title)s.%(ext)s'])
-    
-    # Add URL
-    cmd.append(url)
+    # Output template
+    output_template = output_path or '%(title)s.%(ext)s'
     
     print(f"Downloading video from: {url}")
-    print(f"Command: {' '.join(cmd)}")
+    
+    try:
+        from yt_dlp.utils import DownloadError
+    except ImportError:
+        # Only the yt-dlp command is available (e.g. standalone install)
+        import subprocess
+        
+        cmd = ['yt-dlp', '-f', video_format, '-o', output_template,
+               '-N', str(concurrency), url]
+        
+        print(f"Command: {' '.join(cmd)}")
+        print("-" * 60)
+        
+        try:
+            _run_command(cmd)
+            print("-" * 60)
+            print("✓ Download complete!")
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Error downloading video: {e}")
+            return False
+    
     print("-" * 60)
     
+    # Download in-process, reusing the YoutubeDL instance for identical options.
+    # The output template differs per file, so it is set on the instance
+    # (YoutubeDL keeps templates as a dict keyed by type) rather than cached on.
+    ydl = _get_youtube_dl({
+        'format': video_format,
+        'quiet': False,
+        'concurrent_fragment_downloads': concurrency,
+    })
+    ydl.params['outtmpl']['default'] = output_template
+    
     try:
-        subprocess.run(cmd, check=True)
+        ydl.download([url])
         print("-" * 60)
         print("✓ Download complete!")
         return True
-    except subprocess.CalledProcessError as e:
+    except DownloadError as e:
         print(f"\n❌ Error downloading video: {e}")
         return False
 
 
+def list_formats(url):
+    """
+    Print the formats available for a video (requires yt-dlp).
+    
+    Uses the yt_dlp module in-process when it is importable, reusing one
+    YoutubeDL instance (and its HTTP connections) across calls; otherwise
+    runs the yt-dlp command.
+    """
+    if importlib.util.find_spec('yt_dlp') is None:
+        import subprocess
+        
+        try:
+            _run_command(['yt-dlp', '-F', url])
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Error listing formats: {e}")
+        return
+    
+    from yt_dlp.utils import DownloadError
+    
+    ydl = _get_youtube_dl({'listformats': True, 'quiet': True})
+    try:
+        ydl.extract_info(url, download=False)
+    except DownloadError as e:
+        print(f"\n❌ Error listing formats: {e}")
+
+
 def download_with_curl(url, output_path):
     """
     Download video using curl (for direct video links).
@@ -81,6 +292,8 @@ def download_with_curl(url, output_path):
         url: Direct video URL
         output_path: Output file path
     """
+    import subprocess
+    
     print(f"Downloading video from: {url}")
     print(f"Saving to: {output_path}")
     print("-" * 60)
@@ -94,7 +307,7 @@ def download_with_curl(url, output_path):
     ]
     
     try:
-        subprocess.run(cmd, check=True)
+        _run_command(cmd)
         print("-" * 60)
         print(f"✓ Download complete: {output_path}")
         return True
@@ -111,6 +324,8 @@ def download_with_wget(url, output_path):
         url: Direct video URL
         output_path: Output file path
     """
+    import subprocess
+    
     print(f"Downloading video from: {url}")
     print(f"Saving to: {output_path}")
     print("-" * 60)
@@ -123,7 +338,7 @@ def download_with_wget(url, output_path):
     ]
     
     try:
-        subprocess.run(cmd, check=True)
+        _run_command(cmd)
         print("-" * 60)
         print(f"✓ Download complete: {output_path}")
         return True
@@ -132,42 +347,363 @@ def download_with_wget(url, output_path):
         return False
 
 
-def download_with_python(url, output_path):
+@lru_cache(maxsize=1)
+def _curl_supports_parallel():
+    """Check whether the installed curl has --parallel (added in 7.66.0)."""
+    import subprocess
+    
+    try:
+        output = subprocess.run(['curl', '--version'], capture_output=True,
+                                text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    
+    match = re.match(r'curl (\d+)\.(\d+)', output)
+    return match is not None and (int(match.group(1)), int(match.group(2))) >= (7, 66)
+
+
+def download_many_with_curl(jobs, max_parallel=8):
+    """
+    Download several direct links with a single curl process.
+    
+    curl --parallel fetches them concurrently, sharing its DNS cache and
+    connection pool between URLs. Older curl (before 7.66) fetches them one
+    after another over the same connections instead.
+    
+    Args:
+        jobs: List of (url, output_path) pairs
+        max_parallel: Maximum number of simultaneous transfers
+    
+    Returns:
+        bool: True if every download succeeded (curl reports one status for the batch)
+    """
+    import subprocess
+    
+    print(f"Downloading {len(jobs)} videos with curl")
+    print("-" * 60)
+    
+    cmd = ['curl', '-L']
+    if _curl_supports_parallel():
+        cmd += ['--parallel', '--parallel-max', str(max_parallel)]
+    for url, output_path in jobs:
+        cmd += ['-o', output_path, url]
+    
+    try:
+        _run_command(cmd)
+        print("-" * 60)
+        print("✓ Downloads complete")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"\n❌ Error downloading videos: {e}")
+        return False
+
+
+def download_many_with_wget(urls, output_dir='.'):
+    """
+    Download several direct links with a single wget process.
+    
+    wget names each file after its URL; there's no per-URL output path.
+    
+    Args:
+        urls: List of direct video URLs
+        output_dir: Directory to save the videos in
+    
+    Returns:
+        bool: True if every download succeeded
+    """
+    import subprocess
+    import tempfile
+    
+    print(f"Downloading {len(urls)} videos with wget")
+    print(f"Saving to: {output_dir}")
+    print("-" * 60)
+    
+    with tempfile.NamedTemporaryFile('w', suffix='.txt') as url_list:
+        url_list.write('\n'.join(urls) + '\n')
+        url_list.flush()
+        
+        cmd = ['wget', '-i', url_list.name, '-P', output_dir, '--show-progress']
+        
+        try:
+            _run_command(cmd)
+            print("-" * 60)
+            print("✓ Downloads complete")
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Error downloading videos: {e}")
+            return False
+
+
+def _make_progress(total_size):
+    """
+    Return an update(nbytes) callback that prints download progress,
+    at most once every _PROGRESS_INTERVAL seconds (and always at 100%).
+    """
+    downloaded = 0
+    last_print = 0.0
+    
+    def update(nbytes):
+        nonlocal downloaded, last_print
+        downloaded += nbytes
+        
+        now = time.monotonic()
+        if total_size > 0 and (now - last_print >= _PROGRESS_INTERVAL or downloaded >= total_size):
+            percent = (downloaded / total_size) * 100
+            print(f"Progress: {downloaded}/{total_size} bytes ({percent:.1f}%)", end='\r')
+            last_print = now
+    
+    return update
+
+
+def _preallocate(f, total_size):
+    """
+    Reserve total_size bytes for f up front and advise the kernel that it
+    will be written sequentially (where the platform supports it).
+    """
+    if total_size > 0:
+        try:
+            os.posix_fallocate(f.fileno(), 0, total_size)
+        except (AttributeError, OSError):
+            f.truncate(total_size)  # Sparse file as a fallback
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _drop_cache(path):
+    """Hint the kernel to evict a finished download from the page cache.
+    
+    Best-effort: pages still dirty are left for normal writeback rather than
+    blocking here on a sync, so only what has already been written out is
+    dropped.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+class _ProgressReader:
+    """File-like wrapper that reports the size of every block read through it."""
+    
+    def __init__(self, raw, on_progress):
+        self.raw = raw
+        self.on_progress = on_progress
+    
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.on_progress(len(data))
+        return data
+
+
+def _copy_response(response, f, on_progress):
+    """Copy a streamed response body into f in _COPY_BUFSIZE blocks."""
+    if not hasattr(response, 'raw'):  # httpx
+        for chunk in response.iter_bytes(_COPY_BUFSIZE):
+            f.write(chunk)
+            on_progress(len(chunk))
+        return
+    
+    response.raw.decode_content = True  # Undo gzip/deflate like iter_content does
+    shutil.copyfileobj(_ProgressReader(response.raw, on_progress), f, _COPY_BUFSIZE)
+
+
+def _fetch_range(client, url, start, end, output_path, on_progress):
+    """Download bytes start..end (inclusive) of url into the same offsets of output_path."""
+    with _stream_get(client, url, {'Range': f'bytes={start}-{end}'}) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise RuntimeError(f"Server ignored range request (HTTP {response.status_code})")
+        
+        with open(output_path, 'r+b') as f:
+            f.seek(start)
+            _copy_response(response, f, on_progress)
+
+
+def _download_ranges(client, head, output_path, workers=8):
+    """
+    Download a file as parallel byte ranges (over several connections, or
+    multiplexed over one with HTTP/2).
+    
+    Args:
+        client: requests.Session or HTTP/2 httpx.Client used for all requests
+        head: Response to a HEAD request for the direct video URL
+        output_path: Output file path
+        workers: Maximum number of concurrent ranges
+    
+    Returns:
+        bool: True if downloaded, False if the server doesn't support
+        byte ranges or the file is too small to split
+    """
+    total_size = int(head.headers.get('content-length', 0))
+    parts = min(workers, total_size // _RANGE_MIN_PART)
+    if head.headers.get('accept-ranges') != 'bytes' or parts < 2:
+        return False
+    
+    # Preallocate the file so each range can be written at its offset
+    with open(output_path, 'wb') as f:
+        _preallocate(f, total_size)
+    
+    part_size = -(-total_size // parts)  # Ceiling division
+    ranges = [(start, min(start + part_size, total_size) - 1)
+              for start in range(0, total_size, part_size)]
+    
+    lock = threading.Lock()
+    update_progress = _make_progress(total_size)
+    
+    def on_progress(nbytes):
+        with lock:
+            update_progress(nbytes)
+    
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(_fetch_range, client, str(head.url), start, end, output_path,
+                                   on_progress)
+                   for start, end in ranges]
+        for future in futures:
+            future.result()  # Re-raise any failure
+    
+    return True
+
+
+def _download_stream(client, url, output_path, offset=0, validator=None):
+    """
+    Download url over a single connection.
+    
+    With offset > 0 the download resumes after the first offset bytes already
+    in output_path, provided the file still matches validator (If-Range);
+    otherwise the server sends the whole file and it is rewritten.
+    """
+    headers = None
+    if offset:
+        headers = {'Range': f'bytes={offset}-', 'If-Range': validator}
+    
+    with _stream_get(client, url, headers) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0  # Full body: the file changed (or ranges aren't supported)
+        
+        total_size = offset + int(response.headers.get('content-length', 0))
+        update_progress = _make_progress(total_size)
+        
+        with open(output_path, 'r+b' if offset else 'wb') as f:
+            _preallocate(f, total_size)
+            f.seek(offset)
+            if offset:
+                print(f"Resuming from byte {offset}")
+                update_progress(offset)
+            try:
+                _copy_response(response, f, update_progress)
+            finally:
+                f.truncate()  # Keep only what arrived, so an interrupted download can resume
+
+
+def _get_validator(head):
+    """Return the ETag (or Last-Modified) identifying this version of a file, if any."""
+    etag = head.headers.get('etag')
+    if etag and not etag.startswith('W/'):  # If-Range needs a strong ETag
+        return etag
+    return head.headers.get('last-modified')
+
+
+def _read_sidecar(path):
+    """
+    Return (validator, complete) from the sidecar next to a download.
+    
+    The validator is written when a download starts and marked complete once
+    the whole file has arrived; (None, False) if there is no sidecar.
+    """
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None, False
+    if not lines:
+        return None, False
+    return lines[0], lines[1:] == ['complete']
+
+
+def _write_sidecar(path, validator, complete=False):
+    """Record which version of the file output_path holds (see _read_sidecar)."""
+    with open(path, 'w') as f:
+        f.write(validator + '\n')
+        if complete:
+            f.write('complete\n')
+
+
+def download_with_python(url, output_path, http2=True):
     """
     Download video using Python's requests library (fallback method).
     
     Args:
         url: Direct video URL
         output_path: Output file path
+        http2: Use HTTP/2 via httpx when it is installed
     """
-    try:
-        import requests
-    except ImportError:
-        print("Error: requests library is not installed")
-        print("Install with: pip install requests")
-        return False
+    client = _get_http2_client() if http2 else None
+    if client is None:
+        try:
+            import requests
+        except ImportError:
+            print("Error: requests library is not installed")
+            print("Install with: pip install requests")
+            return False
+        client = _get_session()
     
     print(f"Downloading video from: {url}")
     print(f"Saving to: {output_path}")
     print("-" * 60)
     
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+        head = _head(client, url)
+        sidecar_path = output_path + '.etag'
         
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+        if (head is None or 'content-length' not in head.headers
+                or head.headers.get('accept-ranges') != 'bytes'):
+            # HEAD was rejected or the server can't do ranges: nothing to
+            # resume or split, so stream the whole file over one connection
+            if os.path.exists(sidecar_path):
+                os.remove(sidecar_path)
+            _download_stream(client, url, output_path)
+        else:
+            total_size = int(head.headers.get('content-length', 0))
+            validator = _get_validator(head)
+            existing = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            
+            # The ETag (or Last-Modified) of the version being downloaded is kept
+            # beside the file, and marked complete once it has all arrived
+            saved_validator, complete = _read_sidecar(sidecar_path)
+            
+            if complete and validator == saved_validator and 0 < total_size == existing:
+                print(f"✓ Already downloaded: {output_path}")
+                return True
+            
+            if saved_validator and not complete and 0 < existing < total_size:
+                # Pick up an interrupted download where it stopped. If-Range carries
+                # the version the partial file came from, so the server sends the
+                # whole file instead if it has changed since.
+                _download_stream(client, str(head.url), output_path, existing, saved_validator)
+            else:
+                # Anything else at output_path is unrelated: record the version
+                # before writing, then download from scratch
+                if validator:
+                    _write_sidecar(sidecar_path, validator)
+                elif os.path.exists(sidecar_path):
+                    os.remove(sidecar_path)
+                
+                if not _download_ranges(client, head, output_path):
+                    # Fetch byte ranges in parallel when the server supports it,
+                    # otherwise stream the whole file over one connection
+                    _download_stream(client, str(head.url), output_path)
+            
+            if validator:
+                _write_sidecar(sidecar_path, validator, complete=True)
         
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    # Show progress
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        print(f"Progress: {downloaded}/{total_size} bytes ({percent:.1f}%)", end='\r')
+        _drop_cache(output_path)
         
         print("\n" + "-" * 60)
         print(f"✓ Download complete: {output_path}")
@@ -179,32 +715,60 @@ def download_with_python(url, output_path):
 
 
 def is_direct_video_url(url):
-    """Check if URL is a direct video link."""
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.webm', '.m4v']
-    parsed = urlparse(url)
-    path = parsed.path.lower()
-    return any(path.endswith(ext) for ext in video_extensions)
+    """Check if URL (a string or urlparse result) is a direct video link."""
+    if isinstance(url, str):
+        url = urlparse(url)
+    return _VIDEO_EXT_RE.search(url.path) is not None
 
 
 def is_supported_platform(url):
-    """Check if URL is from a supported video platform."""
-    supported_domains = [
-        'youtube.com', 'youtu.be',
-        'vimeo.com',
-        'dailymotion.com',
-        'twitter.com', 'x.com',
-        'facebook.com',
-        'instagram.com',
-        'tiktok.com',
-        'twitch.tv',
-        'reddit.com'
-    ]
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower().replace('www.', '')
-    return any(supported in domain for supported in supported_domains)
+    """Check if URL (a string or urlparse result) is from a supported video platform."""
+    if isinstance(url, str):
+        url = urlparse(url)
+    return _PLATFORM_RE.search(url.hostname or '') is not None
+
+
+def _resolve_output_path(parsed, output_path=None):
+    """Pick the output file for a parsed URL when none (or no extension) was given."""
+    # Generate output path if not provided
+    if not output_path:
+        if is_direct_video_url(parsed):
+            # Extract filename from URL
+            output_path = os.path.basename(parsed.path)
+            if not output_path:
+                output_path = 'downloaded_video.mp4'
+        else:
+            output_path = 'downloaded_video.mp4'
+    
+    # Ensure output path has an extension
+    if not os.path.splitext(output_path)[1]:
+        output_path += '.mp4'
+    
+    return output_path
+
+
+def _dedupe_output_paths(jobs):
+    """
+    Resolve the output path of each (url, output_path) job, numbering repeats
+    (video.mp4, video_2.mp4, ...) so concurrent downloads can't overwrite
+    or skip one another.
+    """
+    seen = set()
+    resolved = []
+    for url, output_path in jobs:
+        output_path = _resolve_output_path(urlparse(url), output_path)
+        root, ext = os.path.splitext(output_path)
+        n = 1
+        while os.path.normpath(output_path) in seen:
+            n += 1
+            output_path = f"{root}_{n}{ext}"
+        seen.add(os.path.normpath(output_path))
+        resolved.append((url, output_path))
+    return resolved
 
 
-def download_video(url, output_path=None, method='auto', quality='best'):
+def download_video(url, output_path=None, method='auto', quality='best',
+                   concurrency=_FRAGMENT_CONCURRENCY, http2=True):
     """
     Download video from URL using the best available method.
     
@@ -213,6 +777,8 @@ def download_video(url, output_path=None, method='auto', quality='best'):
         output_path: Output file path (optional)
         method: Download method ('auto', 'yt-dlp', 'curl', 'wget', 'python')
         quality: Video quality for yt-dlp ('best', 'worst', or format code)
+        concurrency: Fragments yt-dlp downloads in parallel
+        http2: Let the python method use HTTP/2 (via httpx, if installed)
     
     Returns:
         bool: True if download successful
@@ -222,26 +788,15 @@ def download_video(url, output_path=None, method='auto', quality='best'):
         print("Error: Invalid URL (must start with http:// or https://)")
         return False
     
-    # Generate output path if not provided
-    if not output_path:
-        if is_direct_video_url(url):
-            # Extract filename from URL
-            parsed = urlparse(url)
-            output_path = os.path.basename(parsed.path)
-            if not output_path:
-                output_path = 'downloaded_video.mp4'
-        else:
-            output_path = 'downloaded_video.mp4'
-    
-    # Ensure output path has an extension
-    if not os.path.splitext(output_path)[1]:
-        output_path += '.mp4'
+    parsed = urlparse(url)
+    is_direct = is_direct_video_url(parsed)
+    output_path = _resolve_output_path(parsed, output_path)
     
     # Auto-detect best method
     if method == 'auto':
-        if is_supported_platform(url):
+        if is_supported_platform(parsed):
             method = 'yt-dlp'
-        elif is_direct_video_url(url):
+        elif is_direct:
             method = 'curl'
         else:
             # Try yt-dlp first, fallback to curl
@@ -252,19 +807,83 @@ def download_video(url, output_path=None, method='auto', quality='best'):
     print("")
     
     if method == 'yt-dlp':
-        return download_with_yt_dlp(url, output_path, quality)
+        return download_with_yt_dlp(url, output_path, quality, concurrency)
     elif method == 'curl':
         return download_with_curl(url, output_path)
     elif method == 'wget':
         return download_with_wget(url, output_path)
     elif method == 'python':
-        return download_with_python(url, output_path)
+        return download_with_python(url, output_path, http2)
     else:
         print(f"Error: Unknown method '{method}'")
         return False
 
 
-def main():
+def download_many(jobs, method='auto', quality='best', max_workers=8,
+                  concurrency=_FRAGMENT_CONCURRENCY, http2=True):
+    """
+    Download several videos concurrently.
+    
+    Args:
+        jobs: Iterable of (url, output_path) pairs (output_path may be None)
+        method: Download method, as for download_video
+        quality: Video quality for yt-dlp
+        max_workers: Maximum number of simultaneous downloads
+        concurrency: Fragments yt-dlp downloads in parallel (per video)
+        http2: Let the python method use HTTP/2 (via httpx, if installed)
+    
+    Returns:
+        list: download_video's result for each job, in order (a batched
+        curl/wget run reports the same result for every job)
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    
+    # curl and wget can take the whole list in one process (wget numbers
+    # clashing file names itself)
+    if method == 'wget' and all(output_path is None for _, output_path in jobs):
+        return [download_many_with_wget([url for url, _ in jobs])] * len(jobs)
+    
+    jobs = _dedupe_output_paths(jobs)
+    if method == 'curl':
+        return [download_many_with_curl(jobs, max_workers)] * len(jobs)
+    
+    # Downloads are I/O bound, so threads overlap them; direct links share
+    # the pooled session's connections
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = [executor.submit(download_video, url, output_path, method, quality,
+                                   concurrency, http2)
+                   for url, output_path in jobs]
+        return [future.result() for future in futures]
+
+
+def read_url_list(path):
+    """
+    Read (url, output_path) pairs from a text file.
+    
+    Each non-empty line holds a URL, optionally followed by an output path.
+    Lines starting with '#' are ignored.
+    """
+    jobs = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            url, _, output_path = line.partition(' ')
+            jobs.append((url, output_path.strip() or None))
+    return jobs
+
+
+def _get_parser():
+    """Return the command-line parser, building it on the first call."""
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Download videos from URLs for blob tracking',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -284,6 +903,9 @@ Examples:
   
   # Force specific download method
   python download_video.py "https://example.com/video.mp4" -m curl
+  
+  # Download a list of URLs concurrently (one "URL [output]" per line)
+  python download_video.py --urls-from urls.txt
 
 Supported platforms (with yt-dlp):
   - YouTube, Vimeo, Dailymotion
@@ -295,7 +917,7 @@ For direct video links, curl/wget/python methods work without yt-dlp.
         """
     )
     
-    parser.add_argument('url', help='Video URL to download')
+    parser.add_argument('url', nargs='?', help='Video URL to download')
     parser.add_argument('-o', '--output', 
                        help='Output file path (default: auto-generated)')
     parser.add_argument('-m', '--method', 
@@ -305,11 +927,40 @@ For direct video links, curl/wget/python methods work without yt-dlp.
     parser.add_argument('-q', '--quality',
                        default='best',
                        help='Video quality for yt-dlp (default: best)')
+    parser.add_argument('-N', '--concurrency', type=int,
+                       default=_FRAGMENT_CONCURRENCY,
+                       help=f'Stream fragments yt-dlp downloads in parallel '
+                            f'(default: {_FRAGMENT_CONCURRENCY})')
+    parser.add_argument('--http2', action=argparse.BooleanOptionalAction,
+                       default=True,
+                       help='Use HTTP/2 for the python method when httpx is installed '
+                            '(default: on)')
     parser.add_argument('--list-formats',
                        action='store_true',
                        help='List available formats for the video (yt-dlp only)')
+    parser.add_argument('--urls-from', metavar='FILE',
+                       help='Download every URL listed in FILE concurrently')
+    
+    _PARSER = parser
+    return parser
+
+
+def main(argv=None):
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    
+    if args.urls_from:
+        jobs = read_url_list(args.urls_from)
+        results = download_many(jobs, args.method, args.quality,
+                                concurrency=args.concurrency, http2=args.http2)
+        failed = [url for (url, _), ok in zip(jobs, results) if not ok]
+        print(f"\n✓ Downloaded {len(jobs) - len(failed)}/{len(jobs)} videos")
+        for url in failed:
+            print(f"  ❌ {url}")
+        sys.exit(1 if failed else 0)
     
-    args = parser.parse_args()
+    if not args.url:
+        parser.error('a URL is required (or use --urls-from)')
     
     # List formats if requested
     if args.list_formats:
@@ -319,11 +970,12 @@ For direct video links, curl/wget/python methods work without yt-dlp.
             sys.exit(1)
         
         print(f"Available formats for: {args.url}\n")
-        subprocess.run(['yt-dlp', '-F', args.url])
+        list_formats(args.url)
         sys.exit(0)
     
     # Download video
-    success = download_video(args.url, args.output, args.method, args.quality)
+    success = download_video(args.url, args.output, args.method, args.quality,
+                             args.concurrency, args.http2)
     
     if success:
         print("\n✓ Video ready for blob tracking!")
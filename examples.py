@@ -4,7 +4,10 @@ Example of using the BlobTracker class programmatically.
 This shows how to integrate blob tracking into your own Python scripts.
 """
 
-from blob_tracker import BlobTracker, process_video
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 def example_basic_usage():
@@ -12,6 +15,8 @@ def example_basic_usage():
     print("Example 1: Basic Usage")
     print("-" * 50)
     
+    from blob_tracker import process_video
+    
     process_video(
         input_path='input.mp4',
         output_path='output.mp4',
@@ -28,6 +33,7 @@ def example_custom_tracker():
     print("-" * 50)
     
     import cv2
+    from blob_tracker import BlobTracker
     
     # Create tracker with custom settings
     tracker = BlobTracker(
@@ -58,6 +64,7 @@ def example_real_time_webcam():
     print("-" * 50)
     
     import cv2
+    from blob_tracker import BlobTracker
     
     # Create tracker
     tracker = BlobTracker(trail_length=20, min_blob_size=15)
@@ -69,11 +76,43 @@ def example_real_time_webcam():
         print("Error: Could not open webcam")
         return
     
+    # Ask for compressed 640x480 frames (plenty for blob detection) and
+    # a one-frame driver buffer so we always process the latest frame
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
     print("Webcam opened. Press 'Q' to quit.")
     
+    # Capture on a background thread so grabbing the next frame overlaps
+    # with processing; the queue only ever holds the newest frame
+    latest = queue.Queue(maxsize=1)
+    running = threading.Event()
+    running.set()
+    
+    def put_latest(item):
+        try:
+            latest.get_nowait()  # Drop the stale frame, if any
+        except queue.Empty:
+            pass
+        latest.put_nowait(item)
+    
+    def capture():
+        while running.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            put_latest(frame)
+        put_latest(None)  # Sentinel: capture stopped
+    
+    capture_thread = threading.Thread(target=capture, daemon=True)
+    capture_thread.start()
+    
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        frame = latest.get()
+        if frame is None:
             break
         
         # Process frame (only bright blobs for webcam)
@@ -85,6 +124,8 @@ def example_real_time_webcam():
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
     
+    running.clear()
+    capture_thread.join()
     cap.release()
     cv2.destroyAllWindows()
 
@@ -94,25 +135,42 @@ def example_batch_processing():
     print("\nExample 4: Batch Processing")
     print("-" * 50)
     
+    from blob_tracker import process_video
+    
     videos = [
         ('video1.mp4', 'output1.mp4'),
         ('video2.mp4', 'output2.mp4'),
         ('video3.mp4', 'output3.mp4'),
     ]
     
-    for input_path, output_path in videos:
-        print(f"\nProcessing {input_path} -> {output_path}")
-        try:
-            process_video(
+    # Videos are independent, so process them concurrently
+    # (OpenCV releases the GIL while decoding, tracking and encoding).
+    # Each video already runs three threads (reader, tracker, writer), so
+    # size the pool to match and keep OpenCV's own thread pool to one thread.
+    max_workers = min(len(videos), max(1, (os.cpu_count() or 1) // 3))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for input_path, output_path in videos:
+            print(f"\nProcessing {input_path} -> {output_path}")
+            future = executor.submit(
+                process_video,
                 input_path=input_path,
                 output_path=output_path,
                 detect_bright=True,
                 detect_dark=False,
                 trail_length=30,
-                preview=False
+                preview=False,
+                num_threads=1,
+                show_progress=False  # Progress lines would overwrite each other
             )
-        except Exception as e:
-            print(f"Error processing {input_path}: {e}")
+            futures[future] = input_path
+        
+        for future in as_completed(futures):
+            try:
+                future.result()
+                print(f"Finished {futures[future]}")
+            except Exception as e:
+                print(f"Error processing {futures[future]}: {e}")
 
 
 def main():
@@ -9,15 +9,75 @@ Tracks bright/dark blobs from your webcam in real-time with visual effects:
 
 import cv2
 import numpy as np
-from collections import deque
 import argparse
+import queue
 import sys
+import threading
+import time
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the median falls back to NumPy
+    njit = None
+
+
+# MOG2's default varThreshold (16, i.e. 4 standard deviations) corresponds to
+# the default diff_threshold of 0.15
+MOG2_SIGMAS_PER_THRESHOLD = 4 / 0.15
+
+# Number of trail slots; each blob continues the trail that ended nearest to it
+MAX_TRAILS = 20
+
+# A blob further than this (pixels) from every trail's last point starts a new trail
+TRAIL_MATCH_DISTANCE = 100
+
+# Trails that go unmatched for more than this many frames are retired
+TRAIL_MAX_MISSES = 10
+
+# Corner offsets of a unit square, in cv2.rectangle's drawing order
+SQUARE_CORNERS = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+
+# A grab() faster than this returned a frame that was already queued (stale)
+# rather than waiting for the camera to deliver a new one
+STALE_GRAB_SECONDS = 0.002
+
+# Most queued frames to skip before processing one anyway
+MAX_STALE_FRAMES = 4
+
+# Recorded frames that may wait for the video writer before display blocks
+WRITE_QUEUE_SIZE = 8
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _median_u8(stack, out):
+        """Write the per-pixel median of an (N, H, W) uint8 stack into out (H, W)."""
+        n, height, width = stack.shape
+        mid = n // 2
+        for y in prange(height):
+            hist = np.empty(256, np.int32)
+            for x in range(width):
+                # Counting select: histogram this pixel's N samples, then walk
+                # it to the (mid + 1)-th smallest value
+                hist[:] = 0
+                for k in range(n):
+                    hist[stack[k, y, x]] += 1
+                count = 0
+                for v in range(256):
+                    count += hist[v]
+                    if count > mid:
+                        out[y, x] = v
+                        break
+else:
+    _median_u8 = None
 
 
 class RealtimeBlobTracker:
     def __init__(self, trail_length=30, min_blob_size=10, max_blob_size=500, 
                  max_blobs=None, max_connection_distance=500, 
-                 background_frames=30, diff_threshold=0.15):
+                 background_frames=30, diff_threshold=0.15, background_method='median',
+                 bg_update_interval=None, detect_scale=0.5, antialias=False,
+                 use_opencl=False):
         """
         Initialize the real-time blob tracker with visual effects.
         
@@ -29,6 +89,16 @@ class RealtimeBlobTracker:
             max_connection_distance: Maximum distance to draw connection lines (pixels)
             background_frames: Number of frames to use for background model
             diff_threshold: Threshold for background difference (0.0-1.0)
+            background_method: 'median' (median of recent frames) or 'mog2'
+                (OpenCV's incremental Gaussian-mixture subtractor)
+            bg_update_interval: Frames between median background updates
+                (None = once per background_frames frames)
+            detect_scale: Resolution scale for background subtraction and blob
+                detection (1.0 = full resolution); effects are drawn at full size
+            antialias: Anti-alias trail and connection lines (blob markers
+                are always anti-aliased)
+            use_opencl: Run the mask pipeline on an OpenCL device through
+                cv2.UMat, when one is available
         """
         self.trail_length = trail_length
         self.min_blob_size = min_blob_size
@@ -36,87 +106,189 @@ class RealtimeBlobTracker:
         self.max_blobs = max_blobs
         self.max_connection_distance = max_connection_distance
         self.diff_threshold = diff_threshold
+        self.detect_scale = detect_scale
         
-        # Store blob positions history for trails
-        self.blob_trails = {}
-        self.next_blob_id = 0
+        # Trails and connections are many thin, short-lived lines: plain
+        # 8-connected lines are much cheaper than anti-aliased ones
+        self._line_type = cv2.LINE_AA if antialias else cv2.LINE_8
+        
+        # Store blob positions history for trails: one ring buffer of
+        # (x, y) points per trail, plus how many points each has received
+        self._trail_xy = np.full((MAX_TRAILS, trail_length, 2), -1, dtype=np.int32)
+        self._trail_head = np.zeros(MAX_TRAILS, dtype=np.int64)
+        self._trail_misses = np.zeros(MAX_TRAILS, dtype=np.int64)
         
         # Background subtraction model
         self.background_model = None
         self.background_frames = background_frames
-        self.frame_buffer = deque(maxlen=background_frames)
         self.is_background_initialized = False
+        self.background_method = background_method
+        self.bg_update_interval = bg_update_interval or background_frames
+        self._frames_since_bg = 0
         
-        # Setup blob detector
-        params = cv2.SimpleBlobDetector_Params()
+        # MOG2 subtractor and its latest foreground mask ('mog2' method only)
+        self._mog2 = None
+        self._mog2_mask = None
         
-        # Filter by area
-        params.filterByArea = True
-        params.minArea = min_blob_size
-        params.maxArea = max_blob_size
+        # Circular (N, H, W) uint8 buffer of recent frames, allocated on first frame
+        self._bg_stack = None
+        self._bg_cursor = 0
         
-        # Filter by circularity (0.0 to 1.0)
-        params.filterByCircularity = False
+        # Grayscale copy of the current frame, shared by the background update
+        # and the difference mask (allocated on first frame)
+        self._gray_buf = None
         
-        # Filter by convexity
-        params.filterByConvexity = False
+        # Reused per-frame buffer for the difference mask
+        self._mask_buf = None
         
-        # Filter by inertia
-        params.filterByInertia = False
+        # Structuring element for cleaning up the difference mask
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
         
-        # Filter by color (detect white blobs in mask)
-        params.filterByColor = True
-        params.blobColor = 255
+        # OpenCL (T-API): resize, grayscale, differencing and morphology run on
+        # the device; the median ring and blob detection stay on the CPU
+        self._use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        if use_opencl and not self._use_opencl:
+            print("OpenCL is not available; processing on the CPU")
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        self._background_umat = None
         
-        self.detector = cv2.SimpleBlobDetector_create(params)
+        # Compile the numba median now rather than stalling the first update
+        if _median_u8 is not None and background_method == 'median':
+            _median_u8(np.zeros((background_frames, 1, 1), np.uint8), np.empty((1, 1), np.uint8))
     
-    def _update_background(self, frame):
+    def _detect_blobs(self, mask, scale=1):
         """
-        Update the background model with new frame.
-        Uses median of recent frames for robust background estimation.
+        Find blobs in a binary mask using connected components.
+        
+        Args:
+            mask: Binary mask (255 = foreground)
+            scale: Factor from mask coordinates to frame coordinates
+            
+        Returns:
+            List of cv2.KeyPoint with the blob center in .pt and the
+            equivalent circle diameter in .size (in frame coordinates)
         """
-        # Convert to grayscale and normalize to 0-1
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        normalized = gray.astype(np.float32) / 255.0
+        # Grana's algorithm measured ~3x faster than the default (Spaghetti) at
+        # collecting stats on these sparse masks
+        _, _, stats, centroids = cv2.connectedComponentsWithStatsWithAlgorithm(
+            mask, 8, cv2.CV_32S, cv2.CCL_GRANA)
         
-        # Add frame to buffer
-        self.frame_buffer.append(normalized)
+        # Filter by area (in frame pixels), skipping label 0 (background)
+        areas = stats[1:, cv2.CC_STAT_AREA] * (scale * scale)
+        keep = np.nonzero((areas >= self.min_blob_size) & (areas <= self.max_blob_size))[0]
+        centers = centroids[keep + 1] * scale
+        diameters = 2 * np.sqrt(areas[keep] / np.pi)
         
-        # Once we have enough frames, compute the median background
-        if len(self.frame_buffer) >= self.background_frames:
-            self.background_model = np.median(np.array(self.frame_buffer), axis=0)
+        return [cv2.KeyPoint(x, y, d) for (x, y), d in zip(centers.tolist(), diameters.tolist())]
+    
+    def _update_background(self, gray):
+        """
+        Update the background model with new grayscale frame.
+        Uses median of recent frames for robust background estimation
+        (or feeds the frame to MOG2 with the 'mog2' method).
+        """
+        if self.background_method == 'mog2':
+            self._update_mog2(gray)
+            return
+        
+        if isinstance(gray, cv2.UMat):
+            gray = gray.get()
+        height, width = gray.shape
+        
+        if self._bg_stack is None or self._bg_stack.shape[1:] != (height, width):
+            self._bg_stack = np.empty((self.background_frames, height, width), dtype=np.uint8)
+            self.background_model = np.empty((height, width), dtype=np.uint8)
+            self._bg_cursor = 0
+            self.is_background_initialized = False
+        
+        # Overwrite the oldest slot of the buffer
+        self._bg_stack[self._bg_cursor % self.background_frames] = gray
+        self._bg_cursor += 1
+        self._frames_since_bg += 1
+        
+        # Once the buffer is full, recompute the median background every
+        # bg_update_interval frames (the background changes slowly)
+        if self._bg_cursor >= self.background_frames and (
+                not self.is_background_initialized
+                or self._frames_since_bg >= self.bg_update_interval):
+            if _median_u8 is not None:
+                _median_u8(self._bg_stack, self.background_model)
+            else:
+                mid = self.background_frames // 2
+                self.background_model[:] = np.partition(self._bg_stack, mid, axis=0)[mid]
+            if self._use_opencl:
+                self._background_umat = cv2.UMat(self.background_model)
+            self._frames_since_bg = 0
             self.is_background_initialized = True
     
-    def _create_difference_mask(self, frame):
+    def _update_mog2(self, gray):
+        """Update the MOG2 model with a new grayscale frame and keep its foreground mask."""
+        if self._mog2 is None:
+            self._mog2 = cv2.createBackgroundSubtractorMOG2(
+                history=self.background_frames, varThreshold=16, detectShadows=False)
+        
+        # Follow threshold changes made while running (distance threshold, squared)
+        self._mog2.setVarThreshold((self.diff_threshold * MOG2_SIGMAS_PER_THRESHOLD) ** 2)
+        self._mog2_mask = self._mog2.apply(gray, self._mog2_mask, learningRate=-1)
+        
+        # Give the model background_frames frames to settle before detecting
+        self._bg_cursor += 1
+        if self._bg_cursor >= self.background_frames:
+            self.is_background_initialized = True
+    
+    def reset_background(self):
+        """Discard the background model so it is rebuilt from upcoming frames."""
+        self._bg_cursor = 0
+        self._frames_since_bg = 0
+        self._mog2 = None
+        self.is_background_initialized = False
+    
+    def _create_difference_mask(self, gray):
         """
         Create a binary mask of pixels that differ from the background.
         
         Args:
-            frame: Input frame (BGR)
+            gray: Input frame (grayscale)
             
         Returns:
             Binary mask (255 where difference > threshold, 0 otherwise)
         """
-        # Convert to grayscale and normalize
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        normalized = gray.astype(np.float32) / 255.0
+        if isinstance(gray, cv2.UMat):
+            return self._create_difference_mask_umat(gray)
         
-        # Calculate absolute difference from background
-        diff = np.abs(normalized - self.background_model)
+        if self._mask_buf is None or self._mask_buf.shape != gray.shape:
+            self._mask_buf = np.empty_like(gray)
+        mask = self._mask_buf
         
-        # Create binary mask where difference > threshold
-        mask = (diff > self.diff_threshold).astype(np.uint8) * 255
+        if self.background_method == 'mog2':
+            # MOG2 already produced the foreground mask while updating
+            raw_mask = self._mog2_mask
+        else:
+            # Absolute difference from background, thresholded in 0-255 units
+            cv2.absdiff(gray, self.background_model, dst=mask)
+            cv2.threshold(mask, int(self.diff_threshold * 255), 255, cv2.THRESH_BINARY, dst=mask)
+            raw_mask = mask
         
-        # Apply morphological operations to clean up the mask
-        kernel = np.ones((3, 3), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)  # Remove noise
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)  # Fill holes
+        # Remove speckle noise (the blob detector tolerates small holes)
+        cv2.morphologyEx(raw_mask, cv2.MORPH_OPEN, self._kernel, dst=mask)
         
         return mask
     
+    def _create_difference_mask_umat(self, gray):
+        """Create the difference mask on the OpenCL device, returned as an array."""
+        if self.background_method == 'mog2':
+            raw_mask = self._mog2_mask
+        else:
+            diff = cv2.absdiff(gray, self._background_umat)
+            _, raw_mask = cv2.threshold(diff, int(self.diff_threshold * 255), 255, cv2.THRESH_BINARY)
+        
+        # Remove speckle noise, then download for blob detection
+        return cv2.morphologyEx(raw_mask, cv2.MORPH_OPEN, self._kernel).get()
+    
     def process_frame(self, frame, show_trails=True, show_connections=True, 
                      show_boxes=True, marker_style='both', use_points=False, 
-                     invert_regions=False, show_numbers=False, show_mask=False):
+                     invert_regions=False, show_numbers=False, show_mask=False, out=None):
         """
         Process a single frame and add visual effects using background subtraction.
         
@@ -130,30 +302,53 @@ class RealtimeBlobTracker:
             invert_regions: Invert the region colors (negative effect)
             show_numbers: Show blob numbers as text
             show_mask: Show the difference mask in corner for debugging
+            out: Array (same shape as frame) to draw the result into
+                (None = allocate a new one)
             
         Returns:
-            Processed frame with effects
+            Processed frame with effects (out, or a new array)
         """
+        # Detect on a downscaled copy: background subtraction, morphology and
+        # blob detection all scale with the pixel count
+        src = cv2.UMat(frame) if self._use_opencl else frame
+        if self.detect_scale != 1:
+            small = cv2.resize(src, None, fx=self.detect_scale, fy=self.detect_scale,
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = src
+        
+        # Convert to grayscale once for both the background model and the mask
+        if self._use_opencl:
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        else:
+            if self._gray_buf is None or self._gray_buf.shape != small.shape[:2]:
+                self._gray_buf = np.empty(small.shape[:2], dtype=np.uint8)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        
         # Update background model
-        self._update_background(frame)
+        self._update_background(gray)
         
         # Create output frame
-        output = frame.copy()
+        if out is None:
+            output = frame.copy()
+        else:
+            output = out
+            np.copyto(output, frame)
         
         # If background not initialized yet, just return original frame
         if not self.is_background_initialized:
             # Show initialization message
             cv2.putText(output, "Initializing background model...", 
                        (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-            progress = len(self.frame_buffer) / self.background_frames
+            progress = self._bg_cursor / self.background_frames
             cv2.rectangle(output, (10, 50), (10 + int(300 * progress), 70), (0, 255, 255), -1)
             return output
         
         # Create difference mask
-        mask = self._create_difference_mask(frame)
+        mask = self._create_difference_mask(gray)
         
-        # Detect blobs in the mask
-        blobs = self.detector.detect(mask)
+        # Detect blobs in the mask, in full-resolution coordinates
+        blobs = self._detect_blobs(mask, 1 / self.detect_scale)
         all_blobs = [(blob, (255, 255, 255)) for blob in blobs]
         
         # Limit number of blobs if max_blobs is set
@@ -161,17 +356,10 @@ class RealtimeBlobTracker:
             # Sort by blob size (larger blobs first) and take top N
             all_blobs = sorted(all_blobs, key=lambda x: x[0].size, reverse=True)[:self.max_blobs]
         
-        # If no blobs detected, clean up old trails
-        if not all_blobs:
-            # Don't clear trails immediately - let them fade
-            pass
-        else:
-            # Extract blob centers
+        # Update trails (with no blobs, existing trails age until retired)
+        if show_trails:
             current_positions = [(blob.pt, color) for blob, color in all_blobs]
-            
-            # Update trails
-            if show_trails:
-                self._update_trails(current_positions)
+            self._update_trails(current_positions)
         
         # Draw trails
         if show_trails:
@@ -199,110 +387,137 @@ class RealtimeBlobTracker:
     
     def _update_trails(self, current_positions):
         """Update the position history for each blob."""
-        # Simple assignment: assign current positions to trail IDs
-        # For more complex tracking, you could use distance-based matching
-        
-        # Clear old trails if we have too many
-        if len(self.blob_trails) > 50:
-            self.blob_trails.clear()
-            self.next_blob_id = 0
+        active = self._trail_head > 0
+        assigned = np.full(len(current_positions), -1, dtype=np.int64)
         
-        # Add current positions to trails
-        for i, (pos, color) in enumerate(current_positions):
-            trail_id = i % 20  # Cycle through 20 trail IDs
+        if current_positions and active.any():
+            # Squared distance from each blob to the last point of each trail
+            pts = np.asarray([pos for pos, color in current_positions], dtype=np.float64)
+            last = self._trail_xy[np.arange(MAX_TRAILS), (self._trail_head - 1) % self.trail_length]
+            d2 = ((pts[:, None, :] - last[None, :, :]) ** 2).sum(-1)
+            d2[:, ~active] = np.inf
+            d2[d2 > TRAIL_MATCH_DISTANCE * TRAIL_MATCH_DISTANCE] = np.inf
             
-            if trail_id not in self.blob_trails:
-                self.blob_trails[trail_id] = deque(maxlen=self.trail_length)
-            
-            self.blob_trails[trail_id].append((pos, color))
+            # Greedy nearest-neighbor matching, closest pairs first
+            taken = np.zeros(MAX_TRAILS, dtype=bool)
+            for flat in np.argsort(d2, axis=None).tolist():
+                blob_idx, trail_id = divmod(flat, MAX_TRAILS)
+                if d2[blob_idx, trail_id] == np.inf:
+                    break
+                if assigned[blob_idx] < 0 and not taken[trail_id]:
+                    assigned[blob_idx] = trail_id
+                    taken[trail_id] = True
+        
+        # Unmatched blobs start new trails in free slots (dropped when all are in use)
+        free = np.nonzero(~active)[0].tolist()
+        for blob_idx in np.nonzero(assigned < 0)[0].tolist():
+            if not free:
+                break
+            assigned[blob_idx] = free.pop(0)
+        
+        # Age every trail, then reset the ones that matched a blob this frame
+        self._trail_misses[active] += 1
+        for (pos, color), trail_id in zip(current_positions, assigned.tolist()):
+            if trail_id < 0:
+                continue
+            head = self._trail_head[trail_id]
+            self._trail_xy[trail_id, head % self.trail_length] = (int(pos[0]), int(pos[1]))
+            self._trail_head[trail_id] = head + 1
+            self._trail_misses[trail_id] = 0
+        
+        # Retire trails that have lost their blob
+        retired = self._trail_misses > TRAIL_MAX_MISSES
+        self._trail_head[retired] = 0
+        self._trail_misses[retired] = 0
+    
+    def clear_trails(self):
+        """Forget all motion trails."""
+        self._trail_head[:] = 0
+        self._trail_misses[:] = 0
     
     def _draw_trails(self, frame):
         """Draw motion trails for each blob."""
-        for trail_id, positions in self.blob_trails.items():
-            if len(positions) < 2:
-                continue
+        trails = []
+        for trail_id in np.nonzero(np.minimum(self._trail_head, self.trail_length) >= 2)[0]:
+            head = self._trail_head[trail_id]
+            ring = self._trail_xy[trail_id]
             
-            # Draw trail without fading effect
-            for i in range(len(positions) - 1):
-                if positions[i] is None or positions[i + 1] is None:
-                    continue
-                
-                pos1, color1 = positions[i]
-                pos2, color2 = positions[i + 1]
-                
-                # White color (no fading)
-                trail_color = (255, 255, 255)
-                
-                cv2.line(frame, 
-                        (int(pos1[0]), int(pos1[1])),
-                        (int(pos2[0]), int(pos2[1])),
-                        trail_color, 
-                        1,  # 1px thick
-                        cv2.LINE_AA)
+            # Oldest to newest point; once the ring has wrapped, the oldest is at head
+            if head <= self.trail_length:
+                trails.append(ring[:head])
+            else:
+                trails.append(np.roll(ring, -(head % self.trail_length), axis=0))
+        
+        if trails:
+            # White color (no fading), 1px thick, all trails in one call
+            cv2.polylines(frame, trails, False, (255, 255, 255), 1, self._line_type)
     
     def _draw_connections(self, frame, positions):
         """Draw connecting lines between all detected blobs."""
         if len(positions) < 2:
             return
         
-        # Draw lines between all pairs of blobs
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
-                pos1, color1 = positions[i]
-                pos2, color2 = positions[j]
-                
-                # Calculate distance
-                dist = np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
-                
-                # Only connect if distance is within max_connection_distance
-                if dist < self.max_connection_distance:
-                    # White color (no fading)
-                    line_color = (255, 255, 255)
-                    
-                    cv2.line(frame,
-                            (int(pos1[0]), int(pos1[1])),
-                            (int(pos2[0]), int(pos2[1])),
-                            line_color,
-                            1,  # 1px thick
-                            cv2.LINE_AA)
+        pts = np.asarray([pos for pos, color in positions], dtype=np.float32)
+        
+        # Pairwise squared distances (upper triangle = each pair once); only
+        # connect pairs within max_connection_distance
+        d2 = ((pts[:, None, :] - pts[None, :, :]) ** 2).sum(-1)
+        max_d2 = self.max_connection_distance * self.max_connection_distance
+        pairs_i, pairs_j = np.where(np.triu(d2 < max_d2, k=1))
+        
+        if len(pairs_i) == 0:
+            return
+        
+        # All segments as 2-point polylines in a single call
+        pts = pts.astype(np.int32)
+        segments = np.stack([pts[pairs_i], pts[pairs_j]], axis=1)  # (N, 2, 2)
+        
+        # White color (no fading), 1px thick
+        cv2.polylines(frame, list(segments), False, (255, 255, 255), 1, self._line_type)
     
     def _draw_blobs(self, frame, blobs, marker_style='both', use_points=False, 
                    invert_regions=False, show_numbers=False):
         """Draw markers on detected blobs."""
-        for idx, (blob, color) in enumerate(blobs, 1):
-            x, y = blob.pt
-            size = blob.size
-            
-            # Determine color (inverted or normal)
-            marker_color = (0, 0, 0) if invert_regions else (255, 255, 255)
-            
-            if use_points:
+        if not blobs:
+            return
+        
+        # Determine color (inverted or normal)
+        marker_color = (0, 0, 0) if invert_regions else (255, 255, 255)
+        
+        pts = np.asarray([blob.pt for blob, color in blobs], dtype=np.float64)
+        sizes = np.asarray([blob.size for blob, color in blobs], dtype=np.float64)
+        
+        if use_points:
+            for x, y in pts.astype(np.int32).tolist():
                 # Draw as points (small circles)
-                cv2.circle(frame, (int(x), int(y)), 3, marker_color, -1, cv2.LINE_AA)
+                cv2.circle(frame, (x, y), 3, marker_color, -1, cv2.LINE_AA)
                 # Outer ring
-                cv2.circle(frame, (int(x), int(y)), 6, marker_color, 1, cv2.LINE_AA)
-            else:
-                # Draw as squares
-                if marker_style in ['both', 'outer']:
-                    # Draw outer square
-                    half_size_outer = int(size * 1.5)
-                    top_left_outer = (int(x - half_size_outer), int(y - half_size_outer))
-                    bottom_right_outer = (int(x + half_size_outer), int(y + half_size_outer))
-                    cv2.rectangle(frame, top_left_outer, bottom_right_outer, marker_color, 1, cv2.LINE_AA)
-                
-                if marker_style in ['both', 'inner']:
-                    # Draw inner square
-                    half_size_inner = int(size * 0.5)
-                    top_left_inner = (int(x - half_size_inner), int(y - half_size_inner))
-                    bottom_right_inner = (int(x + half_size_inner), int(y + half_size_inner))
-                    cv2.rectangle(frame, top_left_inner, bottom_right_inner, marker_color, 1, cv2.LINE_AA)
+                cv2.circle(frame, (x, y), 6, marker_color, 1, cv2.LINE_AA)
+        else:
+            # Draw as squares: every square as a closed 4-point polyline, in one call
+            halves = []
+            if marker_style in ['both', 'outer']:
+                halves.append(sizes * 1.5)  # Outer square
+            if marker_style in ['both', 'inner']:
+                halves.append(sizes * 0.5)  # Inner square
+            
+            # (N, 4, 2) corners: top-left, top-right, bottom-right, bottom-left
+            squares = [
+                (pts[:, None, :] + half.astype(np.int32)[:, None, None] * SQUARE_CORNERS).astype(np.int32)
+                for half in halves
+            ]
+            
+            if squares:
+                cv2.polylines(frame, list(np.concatenate(squares)), True, marker_color, 1, cv2.LINE_AA)
+        
+        # Draw blob numbers
+        if show_numbers:
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            font_scale = 0.5
+            thickness = 1
             
-            # Draw blob number
-            if show_numbers:
+            for idx, ((x, y), size) in enumerate(zip(pts.tolist(), sizes.tolist()), 1):
                 text = str(idx)
-                font = cv2.FONT_HERSHEY_SIMPLEX
-                font_scale = 0.5
-                thickness = 1
                 
                 # Get text size for positioning
                 (text_width, text_height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
@@ -316,11 +531,159 @@ class RealtimeBlobTracker:
                           marker_color, thickness, cv2.LINE_AA)
 
 
+def _grab_latest(cap, drain=True):
+    """
+    Grab the newest frame from a capture, skipping frames that queued up
+    while the previous one was being processed (grab() doesn't decode).
+    
+    Args:
+        cap: Open cv2.VideoCapture
+        drain: Skip queued frames; only for cameras that buffer several
+            frames (elsewhere a fast grab() is just a fresh frame)
+    
+    Returns:
+        (ok, dropped): whether a frame was grabbed (decode it with
+        cap.retrieve()) and how many stale frames were skipped
+    """
+    if not drain:
+        return cap.grab(), 0
+    
+    dropped = 0
+    while True:
+        start = time.perf_counter()
+        if not cap.grab():
+            return False, dropped
+        if time.perf_counter() - start >= STALE_GRAB_SECONDS or dropped >= MAX_STALE_FRAMES:
+            return True, dropped
+        dropped += 1
+
+
+def _put_latest(q, item):
+    """Put item on a size-1 queue, replacing any item still waiting there."""
+    try:
+        q.get_nowait()  # Drop the stale item, if any
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
+
+
+def _capture_frames(cap, frame_q, stop_event, drain=True):
+    """Decode the newest camera frame into frame_q until stop_event is set."""
+    dropped_frames = 0
+    last_drop_report = time.monotonic()
+    
+    try:
+        while not stop_event.is_set():
+            # Only decode the newest frame, so latency stays bounded when
+            # processing falls behind the camera
+            ret, dropped = _grab_latest(cap, drain)
+            if ret:
+                ret, frame = cap.retrieve()
+            
+            if not ret:
+                print("Error: Failed to grab frame")
+                break
+            
+            dropped_frames += dropped + (not frame_q.empty())
+            _put_latest(frame_q, frame)
+            
+            now = time.monotonic()
+            if dropped_frames and now - last_drop_report >= 10:
+                print(f"\nSkipped {dropped_frames} stale frames in the last {now - last_drop_report:.0f}s")
+                dropped_frames = 0
+                last_drop_report = now
+    finally:
+        _put_latest(frame_q, None)  # Sentinel: capture stopped
+
+
+def _process_frames(tracker, effects, frame_q, output_q, free_q, reset_event):
+    """
+    Run the tracker on frames from frame_q, handing results to output_q.
+    
+    Results are drawn into buffers returned through free_q once displayed,
+    allocating a new one only when none is free.
+    """
+    try:
+        while True:
+            frame = frame_q.get()
+            if frame is None:
+                break
+            
+            # Background resets are requested from the UI thread but done
+            # here, between frames
+            if reset_event.is_set():
+                reset_event.clear()
+                tracker.reset_background()
+                tracker.clear_trails()
+            
+            try:
+                out = free_q.get_nowait()
+            except queue.Empty:
+                out = None
+            if out is None or out.shape != frame.shape:
+                out = np.empty_like(frame)
+            
+            _put_latest(output_q, tracker.process_frame(frame, out=out, **effects))
+    finally:
+        _put_latest(output_q, None)  # Sentinel: processing stopped
+
+
+def _fourcc_to_str(fourcc):
+    """Decode a CAP_PROP_FOURCC value into its four-character code."""
+    fourcc = int(fourcc)
+    return ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def _configure_camera(cap, width=None, height=None, fps=None):
+    """
+    Request low-latency capture settings, keeping whatever the camera rejects.
+    
+    Asks for the given resolution and frame rate, then MJPG (most webcams
+    only reach their full frame rate with it, unlike raw YUYV) and a
+    one-frame driver queue. Check the result with cap.get(); drivers ignore
+    what they don't support.
+    
+    Returns:
+        bool: True if the camera accepted the one-frame driver queue
+    """
+    if width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+    
+    # Switch format last and check it at the final mode: a driver may take
+    # MJPG at its default resolution and still fail at the one asked for
+    original_fourcc = cap.get(cv2.CAP_PROP_FOURCC)
+    if cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG')) and not cap.grab():
+        # Some drivers accept MJPG and then fail to deliver frames
+        cap.set(cv2.CAP_PROP_FOURCC, original_fourcc)
+        print("Camera failed to deliver MJPG; keeping its default pixel format")
+    
+    # Keep the driver queue short so frames don't pile up behind processing
+    return cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+def _write_frames(write_q, free_q):
+    """Write (video_writer, frame) pairs from write_q until a None sentinel."""
+    while True:
+        item = write_q.get()
+        if item is None:
+            break
+        
+        video_writer, frame = item
+        video_writer.write(frame)
+        free_q.put(frame)  # Recorded; the tracker may draw into it again
+
+
 def run_realtime(camera_id=1, trail_length=30, show_trails=True, 
                  show_connections=True, show_boxes=True, max_blobs=None, 
                  max_connection_distance=500, marker_style='both', use_points=False, 
                  invert_regions=False, show_numbers=False, save_output=None, 
-                 fps=30, background_frames=30, diff_threshold=0.15, show_mask=False):
+                 fps=30, background_frames=30, diff_threshold=0.15, show_mask=False,
+                 background_method='median', bg_update_interval=None, detect_scale=0.5,
+                 antialias=False, use_opencl=False, capture_width=None, capture_height=None):
     """
     Run real-time blob tracking from webcam using background subtraction.
     
@@ -337,10 +700,18 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
         invert_regions: Invert colors (negative effect)
         show_numbers: Show blob numbers as text
         save_output: Path to save video output (None = no recording)
-        fps: FPS for saved video output
+        fps: FPS requested from the camera and used for saved video output
         background_frames: Number of frames for background model
         diff_threshold: Threshold for background difference (0.0-1.0)
         show_mask: Show the difference mask in corner
+        background_method: 'median' or 'mog2' background model
+        bg_update_interval: Frames between median background updates
+            (None = once per background_frames frames)
+        detect_scale: Resolution scale for detection (1.0 = full resolution)
+        antialias: Anti-alias trail and connection lines
+        use_opencl: Run the mask pipeline through OpenCL when available
+        capture_width: Capture width to request from the camera (None = camera default)
+        capture_height: Capture height to request from the camera (None = camera default)
     """
     # Open webcam
     cap = cv2.VideoCapture(camera_id)
@@ -350,13 +721,24 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
         print("Try a different camera ID (e.g., 0, 1, 2)")
         sys.exit(1)
     
-    # Get camera properties
+    short_buffer = _configure_camera(cap, capture_width, capture_height, fps)
+    
+    # Only a camera that queues several frames needs stale frames skipped; file
+    # and network sources return a fresh frame from a fast grab() too
+    drain_stale = isinstance(camera_id, int) and not short_buffer
+    
+    # Get camera properties (what the camera actually accepted)
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    camera_fps = cap.get(cv2.CAP_PROP_FPS)
     
-    print(f"Camera opened: {width}x{height}")
+    print(f"Camera opened: {width}x{height} @ {camera_fps:.0f} FPS "
+          f"({_fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)).strip() or 'unknown format'})")
+    if (capture_width and width != capture_width) or (capture_height and height != capture_height):
+        requested = f"{capture_width or width}x{capture_height or height}"
+        print(f"Note: camera does not support {requested}; using {width}x{height}")
     print(f"Detection: Background subtraction (threshold: {diff_threshold})")
-    print(f"Background model: {background_frames} frames")
+    print(f"Background model: {background_method}, {background_frames} frames")
     print(f"Effects: {'trails ' if show_trails else ''}{'connections ' if show_connections else ''}{'boxes' if show_boxes else ''}")
     print(f"Trail length: {trail_length} frames")
     if max_blobs:
@@ -375,11 +757,12 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
     print("  - - Decrease threshold")
     print("  BACKSPACE - Reset background model")
     
-    # Setup video writer if save_output is specified
+    # Setup video writer if save_output is specified (the codec is also
+    # used for recordings started with R)
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     video_writer = None
     recording = False
     if save_output:
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         video_writer = cv2.VideoWriter(save_output, fourcc, fps, (width, height))
         recording = True
         print(f"\nRecording to: {save_output}")
@@ -390,38 +773,59 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
         max_blobs=max_blobs,
         max_connection_distance=max_connection_distance,
         background_frames=background_frames,
-        diff_threshold=diff_threshold
+        diff_threshold=diff_threshold,
+        background_method=background_method,
+        bg_update_interval=bg_update_interval,
+        detect_scale=detect_scale,
+        antialias=antialias,
+        use_opencl=use_opencl
     )
     
-    # Runtime toggles
-    toggle_trails = show_trails
-    toggle_connections = show_connections
-    toggle_boxes = show_boxes
-    toggle_mask = show_mask
+    # Runtime toggles, read by the processing thread for every frame
+    effects = {
+        'show_trails': show_trails,
+        'show_connections': show_connections,
+        'show_boxes': show_boxes,
+        'marker_style': marker_style,
+        'use_points': use_points,
+        'invert_regions': invert_regions,
+        'show_numbers': show_numbers,
+        'show_mask': show_mask,
+    }
     screenshot_count = 0
     current_threshold = diff_threshold
+    threshold_text = f"Threshold: {current_threshold:.3f}"
+    
+    # Capture, tracking and display run as a three-stage pipeline:
+    # camera -> frame_q -> tracker -> output_q -> this thread. Each hand-off
+    # holds only the newest item, so a slow stage never builds up latency.
+    # Displayed output frames go back to the tracker through free_q for reuse.
+    # Recording runs on its own thread behind write_q, so a slow disk delays
+    # neither display nor tracking (until WRITE_QUEUE_SIZE frames back up).
+    frame_q = queue.Queue(maxsize=1)
+    output_q = queue.Queue(maxsize=1)
+    free_q = queue.Queue()
+    write_q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    stop_event = threading.Event()
+    reset_event = threading.Event()
+    
+    capture_thread = threading.Thread(target=_capture_frames,
+                                      args=(cap, frame_q, stop_event, drain_stale),
+                                      daemon=True)
+    process_thread = threading.Thread(target=_process_frames,
+                                      args=(tracker, effects, frame_q, output_q, free_q, reset_event),
+                                      daemon=True)
+    write_thread = threading.Thread(target=_write_frames, args=(write_q, free_q), daemon=True)
+    capture_thread.start()
+    process_thread.start()
+    write_thread.start()
     
     try:
         while True:
-            ret, frame = cap.read()
-            
-            if not ret:
-                print("Error: Failed to grab frame")
+            processed = output_q.get()
+            if processed is None:
                 break
             
-            # Process frame
-            processed = tracker.process_frame(
-                frame, 
-                toggle_trails, 
-                toggle_connections, 
-                toggle_boxes, 
-                marker_style, 
-                use_points, 
-                invert_regions, 
-                show_numbers,
-                toggle_mask
-            )
-            
             # Add recording indicator
             if recording and video_writer is not None:
                 cv2.circle(processed, (30, 30), 10, (0, 0, 255), -1)
@@ -429,12 +833,11 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
             
             # Show threshold value
-            cv2.putText(processed, f"Threshold: {current_threshold:.3f}", 
+            cv2.putText(processed, threshold_text, 
                        (width - 200, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
             
-            # Write frame if recording
-            if recording and video_writer is not None:
-                video_writer.write(processed)
+            # Record this frame once done with it (see the end of the loop)
+            frame_writer = video_writer if recording else None
             
             # Display frame
             cv2.imshow('Real-time Blob Tracker (Press Q to quit)', processed)
@@ -450,7 +853,6 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
                     # Start new recording
                     timestamp = cv2.getTickCount()
                     filename = f"recording_{int(timestamp)}.mp4"
-                    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
                     video_writer = cv2.VideoWriter(filename, fourcc, fps, (width, height))
                     recording = True
                     print(f"\nStarted recording to: {filename}")
@@ -468,34 +870,46 @@ def run_realtime(camera_id=1, trail_length=30, show_trails=True,
                 cv2.imwrite(screenshot_name, processed)
                 print(f"\nScreenshot saved: {screenshot_name}")
             elif key == ord('t'):
-                toggle_trails = not toggle_trails
-                print(f"\nTrails: {'ON' if toggle_trails else 'OFF'}")
+                effects['show_trails'] = not effects['show_trails']
+                print(f"\nTrails: {'ON' if effects['show_trails'] else 'OFF'}")
             elif key == ord('c'):
-                toggle_connections = not toggle_connections
-                print(f"\nConnections: {'ON' if toggle_connections else 'OFF'}")
+                effects['show_connections'] = not effects['show_connections']
+                print(f"\nConnections: {'ON' if effects['show_connections'] else 'OFF'}")
             elif key == ord('b'):
-                toggle_boxes = not toggle_boxes
-                print(f"\nBoxes: {'ON' if toggle_boxes else 'OFF'}")
+                effects['show_boxes'] = not effects['show_boxes']
+                print(f"\nBoxes: {'ON' if effects['show_boxes'] else 'OFF'}")
             elif key == ord('m'):
-                toggle_mask = not toggle_mask
-                print(f"\nMask view: {'ON' if toggle_mask else 'OFF'}")
+                effects['show_mask'] = not effects['show_mask']
+                print(f"\nMask view: {'ON' if effects['show_mask'] else 'OFF'}")
             elif key == ord('+') or key == ord('='):
                 current_threshold = min(1.0, current_threshold + 0.01)
                 tracker.diff_threshold = current_threshold
+                threshold_text = f"Threshold: {current_threshold:.3f}"
                 print(f"\nThreshold increased: {current_threshold:.3f}")
             elif key == ord('-') or key == ord('_'):
                 current_threshold = max(0.0, current_threshold - 0.01)
                 tracker.diff_threshold = current_threshold
+                threshold_text = f"Threshold: {current_threshold:.3f}"
                 print(f"\nThreshold decreased: {current_threshold:.3f}")
             elif key == 8 or key == 127:  # Backspace/Delete
-                # Reset background model
-                tracker.frame_buffer.clear()
-                tracker.is_background_initialized = False
-                tracker.blob_trails.clear()
+                # Reset background model (done by the processing thread)
+                reset_event.set()
                 print("\nBackground model reset")
+            
+            # Done with this frame: hand it to the writer thread, which
+            # recycles it after writing, or let the tracker draw into it again
+            if frame_writer is not None:
+                write_q.put((frame_writer, processed))
+            else:
+                free_q.put(processed)
     
     finally:
-        # Cleanup
+        # Cleanup: stop capturing, let the pipeline drain, then release
+        stop_event.set()
+        capture_thread.join()
+        process_thread.join()
+        write_q.put(None)  # Finish writing queued frames before releasing
+        write_thread.join()
         cap.release()
         if video_writer is not None:
             video_writer.release()
@@ -521,6 +935,9 @@ Examples:
   # Use more frames for background model (slower adaptation)
   python realtime_blob_tracker.py --bg-frames 60
   
+  # Use OpenCV's MOG2 subtractor instead of the median background
+  python realtime_blob_tracker.py --bg-method mog2
+  
   # Show mask view for debugging
   python realtime_blob_tracker.py --show-mask
   
@@ -559,6 +976,19 @@ How it works:
                        help='Background difference threshold 0.0-1.0 (default: 0.15)')
     parser.add_argument('--bg-frames', type=int, default=30,
                        help='Number of frames for background model (default: 30)')
+    parser.add_argument('--bg-method', choices=['median', 'mog2'], default='median',
+                       help='Background model: median of recent frames, or the incremental '
+                            'MOG2 subtractor (default: median)')
+    parser.add_argument('--bg-interval', type=int, default=None,
+                       help='Frames between median background updates '
+                            '(default: same as --bg-frames)')
+    parser.add_argument('--detect-scale', type=float, default=0.5,
+                       help='Resolution scale for blob detection, 1.0 = full resolution '
+                            '(default: 0.5)')
+    parser.add_argument('--antialias', action='store_true',
+                       help='Anti-alias trail and connection lines (slower)')
+    parser.add_argument('--opencl', action='store_true',
+                       help='Run background subtraction on the GPU via OpenCL, if available')
     parser.add_argument('--trail-length', type=int, default=30,
                        help='Length of motion trails in frames (default: 30)')
     parser.add_argument('--no-trails', action='store_true',
@@ -584,7 +1014,11 @@ How it works:
     parser.add_argument('--save', type=str, default=None,
                        help='Save output to video file (e.g., output.mp4)')
     parser.add_argument('--fps', type=int, default=30,
-                       help='FPS for saved video output (default: 30)')
+                       help='FPS requested from the camera and for saved video output (default: 30)')
+    parser.add_argument('--width', type=int, default=None,
+                       help='Capture width to request from the camera (default: camera default)')
+    parser.add_argument('--height', type=int, default=None,
+                       help='Capture height to request from the camera (default: camera default)')
     
     args = parser.parse_args()
     
@@ -610,7 +1044,14 @@ How it works:
         fps=args.fps,
         background_frames=args.bg_frames,
         diff_threshold=args.threshold,
-        show_mask=args.show_mask
+        show_mask=args.show_mask,
+        background_method=args.bg_method,
+        bg_update_interval=args.bg_interval,
+        detect_scale=args.detect_scale,
+        antialias=args.antialias,
+        use_opencl=args.opencl,
+        capture_width=args.width,
+        capture_height=args.height
     )
 
 
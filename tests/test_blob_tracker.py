@@ -0,0 +1,34 @@
+"""Regression checks for BlobTracker on the generated test video."""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blob_tracker import BlobTracker
+from create_test_video import create_test_video
+
+
+def test_default_mode_draws_effects(tmp_path):
+    """Bright+dark detection (the CLI default) must find blobs in the test video."""
+    video_path = str(tmp_path / 'test_input.mp4')
+    create_test_video(video_path, duration_seconds=1)
+    
+    tracker = BlobTracker()
+    cap = cv2.VideoCapture(video_path)
+    frames_with_effects = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            output = tracker.process_frame(frame, detect_bright=True, detect_dark=True)
+            frames_with_effects += not np.array_equal(output, frame)
+    finally:
+        cap.release()
+    
+    assert frames_with_effects > 0